@@ -1,21 +1,46 @@
 from datetime import datetime
 
+import click
 from flask import Flask
 # In app.py, near the top with other imports
 from dotenv import load_dotenv
 load_dotenv()  # This loads the .env file
 
+from assets import init_assets
+from compression import init_compression
 from config import Config
+from db_profiles import configure_engine_profile, install_sqlite_pragmas
 from extensions import db
+from metrics import init_metrics
+from page_cache import init_page_cache
+from profiling import init_profiling
+from sql_instrumentation import init_sql_instrumentation
+from template_cache import init_template_cache
+from utils import init_structured_logging
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    engine_profile = configure_engine_profile(app)
     db.init_app(app)
+    init_structured_logging(app)
 
     with app.app_context():
+        install_sqlite_pragmas(db.engine, engine_profile["pragmas"])
+        init_sql_instrumentation(app, db.engine)
+        # Metrics reads the request's DB totals from g, which SQL
+        # instrumentation leaves in place, so their relative order is free.
+        init_metrics(app)
+        init_profiling(app)
+        # After metrics/SQL so cache hits are still timed and counted.
+        init_page_cache(app)
+        init_template_cache(app)
+        init_assets(app)
+        # Outermost WSGI layer: wraps everything the app sends.
+        init_compression(app)
+
         from models import Coupon, InventoryItem, MenuItem, Order, OrderItem, User
 
         @app.template_filter("money")
@@ -41,8 +66,85 @@ def create_app():
 
             seed_data()
 
+        @app.cli.command("seed-synthetic")
+        @click.option("--menu-items", default=500, show_default=True)
+        @click.option("--orders", default=100_000, show_default=True)
+        @click.option("--days", default=365, show_default=True, help="Spread orders over this many days.")
+        @click.option("--end-date", type=click.DateTime(["%Y-%m-%d"]), default=None,
+                      help="Last day of trading (default today); fix it for reproducible output.")
+        @click.option("--seed", default=1, show_default=True)
+        @click.option("--batch-size", default=10_000, show_default=True, help="Orders per insert transaction.")
+        @click.option("--workers", default=1, show_default=True)
+        @click.option("--shards", default=0, help="Write into N SQLite files instead of the app database.")
+        @click.option("--shard-dir", default="synthetic_shards", show_default=True)
+        def seed_synthetic_command(**options):
+            from synthetic_data import seed_synthetic
+
+            seed_synthetic(**options)
+
+        @app.cli.command("import-menu")
+        @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+        def import_menu_command(path):
+            from menu_bulk import parse_menu_file, upsert_menu_items
+
+            with open(path, encoding="utf-8-sig") as f:
+                text = f.read()
+            try:
+                inserted, updated = upsert_menu_items(parse_menu_file(text, path.rsplit(".", 1)[-1].lower()))
+            except ValueError as e:
+                raise click.ClickException(str(e)) from None
+            print(f"Imported menu: {inserted} added, {updated} updated")
+
+        @app.cli.command("import-stock")
+        @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+        @click.option("--adjust", is_flag=True, help="Add quantities to stock instead of replacing it.")
+        def import_stock_command(path, adjust):
+            from inventory_bulk import apply_stock_changes, parse_stock_lines
+
+            with open(path, encoding="utf-8-sig") as f:
+                text = f.read()
+            try:
+                updated, unknown = apply_stock_changes(parse_stock_lines(text), "adjust" if adjust else "set")
+            except ValueError as e:
+                raise click.ClickException(str(e)) from None
+            print(f"Stock updated for {updated} items")
+            if unknown:
+                print(f"Unknown item ids skipped: {', '.join(map(str, unknown))}")
+
+        @app.cli.command("import-recipes")
+        @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+        def import_recipes_command(path):
+            from recipes import parse_recipe_lines, replace_recipes
+
+            with open(path, encoding="utf-8-sig") as f:
+                text = f.read()
+            try:
+                count = replace_recipes(parse_recipe_lines(text))
+            except ValueError as e:
+                raise click.ClickException(str(e)) from None
+            print(f"Saved {count} recipe components")
+
+        @app.cli.command("build-assets")
+        @click.option("--no-download", is_flag=True, help="Use vendored files already in static/vendor.")
+        def build_assets_command(no_download):
+            from assets import build_assets, download_vendor_assets
+
+            if not no_download:
+                for path in download_vendor_assets(app.static_folder):
+                    print(f"Downloaded {path}")
+            manifest = build_assets(app.static_folder)
+            app.extensions["asset_manifest"] = manifest
+            print(f"Built {len(manifest)} assets into static/dist")
+
+        @app.cli.command("upgrade-db")
+        def upgrade_db_command():
+            from migrations import upgrade_db
+
+            upgrade_db()
+
     from blueprints.admin import bp as admin_bp
     from blueprints.auth import bp as auth_bp
+    from blueprints.health import bp as health_bp
     from blueprints.inventory import bp as inventory_bp
     from blueprints.menu import bp as menu_bp
     from blueprints.orders import bp as orders_bp
@@ -56,12 +158,20 @@ def create_app():
     app.register_blueprint(staff_bp)
     app.register_blueprint(inventory_bp)
     app.register_blueprint(reports_bp)
+    app.register_blueprint(health_bp)
 
     return app
 
 
-app = create_app()
+def __getattr__(name):
+    # `app:app` (gunicorn, flask run) still works, but importing this module
+    # no longer builds an application as a side effect.
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
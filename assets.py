@@ -0,0 +1,148 @@
+"""Fingerprinted, precompressed static assets.
+
+``flask build-assets`` downloads the vendored third-party files (Bootstrap)
+into ``static/vendor/``, then copies every file under ``static/`` to
+``static/dist/`` with a content hash in its name, writes ``.gz`` (and
+``.br`` when the optional ``brotli`` package is installed) siblings for
+text assets, and records the mapping in ``static/dist/manifest.json``.
+
+Templates link assets with ``asset_url('css/styles.css')``. With a manifest
+this points at ``/assets/<hashed name>``, served with a one-year immutable
+Cache-Control and the best precompressed variant the client accepts; without
+one it falls back to ``url_for('static', ...)`` (or the CDN for vendored
+files that have not been downloaded), so a fresh checkout still works.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import urllib.request
+
+from flask import abort, current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # optional; gzip alone still covers every browser
+    brotli = None
+
+DIST_DIR = "dist"
+MANIFEST = "manifest.json"
+
+# Local path under static/ -> upstream URL.
+VENDOR_ASSETS = {
+    "vendor/bootstrap.min.css": "https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css",
+    "vendor/bootstrap.bundle.min.js": "https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js",
+}
+
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt", ".html", ".map"}
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def download_vendor_assets(static_dir: str, force: bool = False) -> list[str]:
+    fetched = []
+    for rel_path, url in VENDOR_ASSETS.items():
+        dest = os.path.join(static_dir, rel_path)
+        if os.path.exists(dest) and not force:
+            continue
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with urllib.request.urlopen(url, timeout=30) as resp, open(dest + ".tmp", "wb") as f:
+            shutil.copyfileobj(resp, f)
+        os.replace(dest + ".tmp", dest)
+        fetched.append(rel_path)
+    return fetched
+
+
+def _fingerprinted_name(rel_path: str, data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{digest}{ext}"
+
+
+def build_assets(static_dir: str) -> dict:
+    """Rebuild ``static/dist`` from ``static/``; returns the manifest."""
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    os.makedirs(dist_dir)
+
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(static_dir):
+        if os.path.abspath(dirpath) == os.path.abspath(static_dir):
+            dirnames[:] = [d for d in dirnames if d != DIST_DIR]
+        for filename in sorted(filenames):
+            src = os.path.join(dirpath, filename)
+            rel_path = os.path.relpath(src, static_dir).replace(os.sep, "/")
+            with open(src, "rb") as f:
+                data = f.read()
+
+            hashed = _fingerprinted_name(rel_path, data)
+            dest = os.path.join(dist_dir, hashed)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            with open(dest, "wb") as f:
+                f.write(data)
+
+            if os.path.splitext(rel_path)[1] in COMPRESSIBLE:
+                # mtime=0 keeps the .gz byte-identical across builds.
+                _write_if_smaller(dest + ".gz", gzip.compress(data, compresslevel=9, mtime=0), data)
+                if brotli is not None:
+                    _write_if_smaller(dest + ".br", brotli.compress(data, quality=11), data)
+
+            manifest[rel_path] = hashed
+
+    with open(os.path.join(dist_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def _write_if_smaller(path: str, compressed: bytes, original: bytes) -> None:
+    if len(compressed) < len(original):
+        with open(path, "wb") as f:
+            f.write(compressed)
+
+
+def load_manifest(static_dir: str) -> dict:
+    try:
+        with open(os.path.join(static_dir, DIST_DIR, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def asset_url(filename: str) -> str:
+    hashed = current_app.extensions["asset_manifest"].get(filename)
+    if hashed is not None:
+        return url_for("assets", filename=hashed)
+    if filename in VENDOR_ASSETS and not os.path.exists(os.path.join(current_app.static_folder, filename)):
+        return VENDOR_ASSETS[filename]
+    return url_for("static", filename=filename)
+
+
+def serve_asset(filename: str):
+    dist_dir = os.path.join(current_app.static_folder, DIST_DIR)
+    # Precompressed variants are only served through content negotiation.
+    if filename == MANIFEST or filename.endswith((".gz", ".br")):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    encoding = None
+    accepted = request.accept_encodings
+    for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if accepted[candidate] and os.path.exists(os.path.join(dist_dir, filename + suffix)):
+            encoding = candidate
+            filename = filename + suffix
+            break
+
+    response = send_from_directory(dist_dir, filename, mimetype=mimetype, max_age=31536000)
+    response.headers["Cache-Control"] = IMMUTABLE
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_assets(app) -> None:
+    app.extensions["asset_manifest"] = load_manifest(app.static_folder)
+    app.add_url_rule("/assets/<path:filename>", "assets", serve_asset)
+    app.jinja_env.globals["asset_url"] = asset_url
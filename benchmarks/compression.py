@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Pick the response compression level and size threshold.
+
+Renders the menu, staff order list and reports pages from a synthetic
+database, then for each gzip level (and brotli quality, if installed)
+measures compression time and compressed size, and estimates time to first
+byte plus transfer over a slow mobile link and fast Wi-Fi. Also shows how
+much small responses gain, which drives COMPRESSION_MIN_SIZE. Run:
+
+    python benchmarks/compression.py [--menu-items 200] [--orders 2000]
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LINKS = {"3g (1.5 Mbit/s)": 1.5e6 / 8, "wifi (50 Mbit/s)": 50e6 / 8}
+PAGES = [("menu", "/menu?mode=all"), ("staff orders", "/staff/orders"), ("reports", "/staff/reports")]
+
+
+def _render_pages(menu_items: int, orders: int) -> dict[str, bytes]:
+    tmpdir = tempfile.mkdtemp(prefix="cafe_compress_")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmpdir, 'compress.db')}",
+        "STAFF_SETUP_CODE": "compress",
+        "AUTH_RATE_LIMIT_ENABLED": "false",
+        "COMPRESSION_ENABLED": "false",
+        "GMAIL_EMAIL": "",
+    })
+    from app import create_app
+    from synthetic_data import seed_synthetic
+
+    app = create_app()
+    with app.app_context():
+        seed_synthetic(menu_items=menu_items, orders=orders, days=30, seed=1)
+
+    client = app.test_client()
+    client.post("/staff/register", data={"email": "c@example.com", "password": "pw", "setup_code": "compress"})
+    client.post("/login", data={"email": "c@example.com", "password": "pw"})
+    return {name: client.get(path).data for name, path in PAGES}
+
+
+def _time_it(fn, data: bytes, repeat: int = 20) -> tuple[float, int]:
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(data)
+        best = min(best, time.perf_counter() - start)
+        size = len(out)
+    return best, size
+
+
+def _codecs():
+    codecs = [(f"gzip-{level}", lambda d, level=level: gzip.compress(d, compresslevel=level, mtime=0))
+              for level in (1, 3, 4, 5, 6, 7, 9)]
+    try:
+        import brotli
+
+        codecs += [(f"br-{q}", lambda d, q=q: brotli.compress(d, quality=q)) for q in (1, 4, 5, 6, 9)]
+    except ImportError:
+        pass
+    return codecs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--menu-items", type=int, default=200)
+    parser.add_argument("--orders", type=int, default=2000)
+    args = parser.parse_args()
+
+    pages = _render_pages(args.menu_items, args.orders)
+    codecs = _codecs()
+
+    for name, body in pages.items():
+        print(f"\n== {name}: {len(body):,} bytes")
+        header = f"{'codec':<8} {'bytes':>9} {'ratio':>6} {'cpu ms':>7}"
+        for link in LINKS:
+            header += f" {link:>18}"
+        print(header)
+        row = f"{'none':<8} {len(body):>9,} {1:>6.2f} {0:>7.2f}"
+        for bps in LINKS.values():
+            row += f" {len(body) / bps * 1000:>15.1f} ms"
+        print(row)
+        for codec, fn in codecs:
+            seconds, size = _time_it(fn, body)
+            row = f"{codec:<8} {size:>9,} {size / len(body):>6.2f} {seconds * 1000:>7.2f}"
+            for bps in LINKS.values():
+                row += f" {(seconds + size / bps) * 1000:>15.1f} ms"
+            print(row)
+
+    print("\n== small responses (gzip-6): bytes saved vs one 1460-byte TCP segment")
+    sample = pages["menu"]
+    for size in (256, 512, 1024, 1460, 2048, 4096):
+        body = sample[:size]
+        seconds, out = _time_it(lambda d: gzip.compress(d, compresslevel=6, mtime=0), body, repeat=200)
+        print(f"{size:>6} bytes -> {out:>5} bytes ({size - out:>5} saved) in {seconds * 1e6:>6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Compare concurrent read/write throughput under each database engine profile.
+
+Writer threads insert POS-style orders (one order plus two lines per
+transaction) while reader threads run the daily-totals report query. Run:
+
+    python benchmarks/db_profiles.py                     # SQLite: default vs sqlite
+    python benchmarks/db_profiles.py --url postgresql://... --destroy  # default vs postgres
+
+Every run drops and recreates all tables, so ``--url`` must point at a
+scratch database and is refused without ``--destroy``.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.exc import OperationalError
+
+from config import Config
+from db_profiles import get_profile, install_sqlite_pragmas
+from extensions import db
+from models import MenuItem, Order, OrderItem
+
+
+def _config_dict() -> dict:
+    return {k: getattr(Config, k) for k in dir(Config) if k.isupper()}
+
+
+def build_engine(url: str, profile_name: str):
+    profile = get_profile(profile_name, url, _config_dict())
+    engine = create_engine(url, **profile["engine_options"])
+    install_sqlite_pragmas(engine, profile["pragmas"])
+    return engine
+
+
+def prepare(engine) -> None:
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(MenuItem),
+            [
+                {"name": f"Item {i}", "category": "Bench", "price_cents": 10000 + i,
+                 "is_available_online": True, "is_available_offline": True}
+                for i in range(1, 21)
+            ],
+        )
+
+
+def writer(engine, stop: threading.Event, stats: dict, lock: threading.Lock) -> None:
+    ok = err = 0
+    while not stop.is_set():
+        try:
+            with engine.begin() as conn:
+                order_id = conn.execute(
+                    insert(Order).values(
+                        customer_name="Bench", customer_phone="-", mode="offline",
+                        status="completed", subtotal_cents=30000, discount_cents=0,
+                        total_cents=30000, payment_mode="cash", created_at=datetime.utcnow(),
+                    )
+                ).inserted_primary_key[0]
+                conn.execute(
+                    insert(OrderItem),
+                    [
+                        {"order_id": order_id, "menu_item_id": 1, "quantity": 1,
+                         "unit_price_cents": 10000, "line_total_cents": 10000},
+                        {"order_id": order_id, "menu_item_id": 2, "quantity": 2,
+                         "unit_price_cents": 10000, "line_total_cents": 20000},
+                    ],
+                )
+            ok += 1
+        except OperationalError:
+            err += 1
+    with lock:
+        stats["writes"] += ok
+        stats["write_errors"] += err
+
+
+def reader(engine, stop: threading.Event, stats: dict, lock: threading.Lock) -> None:
+    day = func.date(Order.created_at)
+    query = (
+        select(day, func.count(Order.id), func.coalesce(func.sum(Order.total_cents), 0))
+        .group_by(day)
+        .order_by(day.desc())
+        .limit(14)
+    )
+    ok = err = 0
+    while not stop.is_set():
+        try:
+            with engine.connect() as conn:
+                conn.execute(query).all()
+            ok += 1
+        except OperationalError:
+            err += 1
+    with lock:
+        stats["reads"] += ok
+        stats["read_errors"] += err
+
+
+def run(url: str, profile_name: str, writers: int, readers: int, seconds: float) -> dict:
+    engine = build_engine(url, profile_name)
+    prepare(engine)
+
+    stats = {"writes": 0, "write_errors": 0, "reads": 0, "read_errors": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+    threads = [threading.Thread(target=writer, args=(engine, stop, stats, lock)) for _ in range(writers)]
+    threads += [threading.Thread(target=reader, args=(engine, stop, stats, lock)) for _ in range(readers)]
+
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    stats["writes_per_s"] = stats["writes"] / elapsed
+    stats["reads_per_s"] = stats["reads"] / elapsed
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Database URL (defaults to a temporary SQLite file)")
+    parser.add_argument(
+        "--destroy", action="store_true", help="Allow dropping every table in the --url database"
+    )
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    if args.url and not args.destroy:
+        parser.error("--url database will be wiped (all tables dropped); pass --destroy to confirm")
+
+    tmpdir = None
+    url = args.url
+    if not url:
+        tmpdir = tempfile.mkdtemp(prefix="cafe_bench_")
+        url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    tuned = "sqlite" if url.startswith("sqlite") else "postgres"
+    print(f"{'profile':<10} {'writes/s':>10} {'w-errors':>9} {'reads/s':>10} {'r-errors':>9}")
+    for name in ("default", tuned):
+        if tmpdir:
+            # Start each SQLite run from a fresh file so WAL state does not leak.
+            url = f"sqlite:///{os.path.join(tmpdir, f'bench_{name}.db')}"
+        s = run(url, name, args.writers, args.readers, args.seconds)
+        print(
+            f"{name:<10} {s['writes_per_s']:>10.1f} {s['write_errors']:>9} "
+            f"{s['reads_per_s']:>10.1f} {s['read_errors']:>9}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Load-test recipe: gunicorn defaults vs the shipped gunicorn.conf.py.
+
+Seeds a throwaway SQLite database, starts gunicorn once with an empty
+config (sync worker, 1 process) and once with gunicorn.conf.py, and drives
+each with keep-alive client threads for a fixed time. Prints requests/s and
+latency percentiles for both.
+
+    python benchmarks/gunicorn_load.py [--clients 32] [--seconds 15] [--path /menu]
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed_database(env: dict) -> None:
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "app", "seed"],
+        cwd=ROOT, env=env, check=True, capture_output=True,
+    )
+
+
+def start_gunicorn(config_path: str, port: int, env: dict) -> subprocess.Popen:
+    env = dict(env, GUNICORN_BIND=f"127.0.0.1:{port}", GUNICORN_ACCESSLOG="")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", config_path, "--bind", f"127.0.0.1:{port}", "app:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/menu")
+            conn.getresponse().read()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("gunicorn did not start")
+
+
+def stop_gunicorn(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def drive(port: int, paths: list[str], clients: int, seconds: float) -> dict:
+    """Hit ``paths`` round-robin from ``clients`` keep-alive connections."""
+    latencies: list[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local, local_errors, i = [], 0, 0
+        while not stop.is_set():
+            path = paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status >= 500:
+                    local_errors += 1
+                local.append(time.perf_counter() - start)
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": (statistics.fmean(latencies) * 1000) if latencies else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--path", action="append", dest="paths")
+    args = parser.parse_args()
+    paths = args.paths or ["/menu", "/orders/track", "/login"]
+
+    tmpdir = tempfile.mkdtemp(prefix="cafe_load_")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'load.db')}")
+    seed_database(env)
+
+    empty_config = os.path.join(tmpdir, "defaults.conf.py")
+    open(empty_config, "w").close()
+    runs = [("defaults", empty_config), ("gunicorn.conf.py", os.path.join(ROOT, "gunicorn.conf.py"))]
+
+    print(f"{'config':<18} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for label, config_path in runs:
+        port = free_port()
+        proc = start_gunicorn(config_path, port, env)
+        try:
+            r = drive(port, paths, args.clients, args.seconds)
+        finally:
+            stop_gunicorn(proc)
+        print(f"{label:<18} {r['rps']:>9.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+              f"{r['p99_ms']:>8.1f} {r['errors']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: menu search index build and query latency.
+
+Indexes a synthetic menu (``synthetic_data.generate_menu`` plus random
+tags) and times a mix of full-word, prefix and multi-word queries, both
+cold (the per-index term memo cleared before every sample, as for the first
+request after a menu change) and warm (repeated queries served from it). Run:
+
+    python benchmarks/menu_search.py [--items 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache_utils import MenuItemRow
+from menu_search import MenuSearchIndex
+from synthetic_data import generate_menu
+
+TAGS = ["vegan", "dairy", "spicy", "hot", "iced", "gluten-free", "nuts", "sweet", "bestseller", "new"]
+QUERIES = ["latte", "choc", "c", "spicy", "iced coff", "vegan sand", "cold brew", "dessert", "zzz", "mas chai"]
+
+
+def _menu(count: int) -> tuple:
+    rng = random.Random(1)
+    rows = []
+    for row in generate_menu(count, seed=1, start_id=1):
+        row["tags"] = ",".join(rng.sample(TAGS, rng.randint(0, 3))) or None
+        rows.append(MenuItemRow(**row))
+    return tuple(sorted(rows, key=lambda r: (r.category, r.name)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--number", type=int, default=2000, help="Timed runs per query.")
+    args = parser.parse_args()
+
+    items = _menu(args.items)
+    start = time.perf_counter()
+    index = MenuSearchIndex(items)
+    print(f"indexed {len(items):,} items in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(f"{'query':<12} {'hits':>6} {'cold mean':>10} {'cold p99':>9} {'warm mean':>10} {'warm p99':>9}  (us)")
+    for query in QUERIES:
+        hits = len(index.search(query, limit=len(items)))
+        stats = []
+        for cold in (True, False):
+            samples = []
+            for _ in range(args.number):
+                if cold:
+                    index._term_cache.clear()
+                start = time.perf_counter()
+                index.search(query, limit=50)
+                samples.append(time.perf_counter() - start)
+            samples.sort()
+            stats += [sum(samples) / len(samples), samples[int(len(samples) * 0.99) - 1]]
+        cold_mean, cold_p99, warm_mean, warm_p99 = (v * 1e6 for v in stats)
+        print(f"{query:<12} {hits:>6} {cold_mean:>10.1f} {cold_p99:>9.1f} {warm_mean:>10.1f} {warm_p99:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Benchmark recipe-based inventory depletion.
+
+Builds a synthetic menu where every item uses 2-6 of a pool of ingredients,
+then compares, per committed transaction:
+
+  * per-row: load each affected inventory row and update it through the ORM
+    (one UPDATE per ingredient, as the POS path did before recipes);
+  * executemany: the ``DEPLETE_STOCK`` UPDATE for one order, and over the
+    lines of --batch POS orders at once;
+  * arrays (Postgres only): the single ``UPDATE ... FROM unnest(...)``
+    statement ``recipes.deplete_inventory`` uses there, likewise;
+  * CASE: a single ``SET stock = stock - CASE id WHEN ... END`` statement
+    per order and per batch, the alternative deplete_inventory rejected.
+
+Also times the sparse vector-matrix product on its own. Runs on a temporary
+SQLite file by default; --url points it at an empty scratch database
+instead (all its tables are dropped first, so --destroy is required):
+
+    python benchmarks/recipes.py [--menu-items 5000] [--ingredients 300] [--orders 2000]
+    python benchmarks/recipes.py --url postgresql://.../scratch --destroy
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LINES_PER_ORDER = ([1, 2, 3, 4, 5], [40, 30, 17, 9, 4])
+
+
+def _setup(url: str | None, menu_items: int, ingredients: int):
+    if not url:
+        tmpdir = tempfile.mkdtemp(prefix="cafe_recipes_")
+        url = f"sqlite:///{os.path.join(tmpdir, 'recipes.db')}"
+    os.environ.update({
+        "DATABASE_URL": url,
+        "STAFF_SETUP_CODE": "recipes",
+        "GMAIL_EMAIL": "",
+    })
+    from app import create_app
+    from extensions import db
+    from models import InventoryItem
+    from recipes import replace_recipes
+    from synthetic_data import seed_synthetic
+
+    app = create_app()
+    ctx = app.app_context()
+    ctx.push()
+    db.drop_all()
+    seed_synthetic(menu_items=menu_items, orders=0, days=1, seed=1)
+
+    first = db.session.scalar(db.select(db.func.max(InventoryItem.id))) + 1
+    db.session.execute(db.insert(InventoryItem.__table__), [
+        {"name": f"Ingredient {i}", "stock": 10**9, "reorder_threshold": 0} for i in range(ingredients)
+    ])
+    rng = random.Random(1)
+    pool = range(first, first + ingredients)
+    replace_recipes([
+        (menu_item_id, ingredient, rng.randint(1, 200))
+        for menu_item_id in range(1, menu_items + 1)
+        for ingredient in rng.sample(pool, rng.randint(2, 6))
+    ])
+    return app, ctx
+
+
+def _orders(count: int, menu_items: int) -> list[list[tuple[int, int]]]:
+    rng = random.Random(2)
+    counts, weights = LINES_PER_ORDER
+    return [
+        [(rng.randint(1, menu_items), rng.choice((1, 1, 1, 2, 3))) for _ in range(rng.choices(counts, weights)[0])]
+        for _ in range(count)
+    ]
+
+
+def _per_row(lines, matrix) -> None:
+    from extensions import db
+    from models import InventoryItem
+    from recipes import depletion_vector
+
+    totals = depletion_vector(lines, matrix)
+    rows = db.session.scalars(db.select(InventoryItem).where(InventoryItem.id.in_(totals))).all()
+    for row in rows:
+        row.stock = max(0, row.stock - totals[row.id])
+        row.low_stock = row.stock <= row.reorder_threshold
+    db.session.commit()
+
+
+def _case_statement(lines, matrix) -> None:
+    from sqlalchemy import case, update
+
+    from extensions import db
+    from models import InventoryItem
+    from recipes import depletion_vector
+
+    totals = depletion_vector(lines, matrix)
+    table = InventoryItem.__table__
+    remaining = table.c.stock - case(dict(totals), value=table.c.id)
+    new_stock = case((remaining < 0, 0), else_=remaining)
+    db.session.execute(
+        update(table)
+        .where(table.c.id.in_(list(totals)))
+        .values(stock=new_stock, low_stock=new_stock <= table.c.reorder_threshold)
+    )
+    db.session.commit()
+
+
+def _executemany(lines, matrix) -> None:
+    from extensions import db
+    from recipes import DEPLETE_STOCK, depletion_vector
+
+    totals = depletion_vector(lines, matrix)
+    db.session.execute(DEPLETE_STOCK, [{"b_id": i, "amount": q} for i, q in sorted(totals.items())])
+    db.session.commit()
+
+
+def _arrays(lines, matrix) -> None:
+    from extensions import db
+    from recipes import DEPLETE_STOCK_ARRAYS, depletion_vector
+
+    totals = sorted(depletion_vector(lines, matrix).items())
+    db.session.execute(DEPLETE_STOCK_ARRAYS, {"ids": [i for i, _ in totals], "amounts": [q for _, q in totals]})
+    db.session.commit()
+
+
+def _report(label: str, seconds: float, orders: int, transactions: int) -> None:
+    print(f"{label:<24} {orders / seconds:>10,.0f} orders/s {seconds / transactions * 1000:>9.3f} ms/txn")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--menu-items", type=int, default=5000)
+    parser.add_argument("--ingredients", type=int, default=300)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=100, help="POS orders per batched UPDATE.")
+    parser.add_argument("--url", help="Scratch database URL (defaults to a temporary SQLite file)")
+    parser.add_argument(
+        "--destroy", action="store_true", help="Allow dropping every table in the --url database"
+    )
+    args = parser.parse_args()
+    if args.url and not args.destroy:
+        parser.error("--url database will be wiped (all tables dropped); pass --destroy to confirm")
+
+    _, ctx = _setup(args.url, args.menu_items, args.ingredients)
+    from cache_utils import get_recipe_matrix
+    from extensions import db
+    from recipes import depletion_vector
+
+    matrix = get_recipe_matrix()
+    orders = _orders(args.orders, args.menu_items)
+    nnz = sum(len(r) for r in matrix.values())
+    print(f"recipe matrix: {len(matrix):,} menu items x {args.ingredients} ingredients, {nnz:,} non-zeros")
+
+    start = time.perf_counter()
+    for lines in orders:
+        depletion_vector(lines, matrix)
+    seconds = time.perf_counter() - start
+    print(f"{'vector x matrix':<24} {seconds / len(orders) * 1e6:>10.1f} us/order")
+
+    start = time.perf_counter()
+    for lines in orders:
+        _per_row(lines, matrix)
+    _report("per-row ORM updates", time.perf_counter() - start, len(orders), len(orders))
+
+    batches = [
+        [line for lines in orders[i:i + args.batch] for line in lines]
+        for i in range(0, len(orders), args.batch)
+    ]
+    variants = [("executemany", _executemany), ("CASE", _case_statement)]
+    if db.engine.dialect.name == "postgresql":
+        variants.insert(1, ("arrays", _arrays))
+    else:
+        print("(arrays variant skipped: Postgres only)")
+    for label, apply in variants:
+        start = time.perf_counter()
+        for lines in orders:
+            apply(lines, matrix)
+        _report(f"{label}, per order", time.perf_counter() - start, len(orders), len(orders))
+
+        start = time.perf_counter()
+        for lines in batches:
+            apply(lines, matrix)
+        _report(f"{label}, {args.batch}/batch", time.perf_counter() - start, len(orders), len(batches))
+
+    ctx.pop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark suite for the ordering hot paths.
+
+Seeds a throwaway SQLite database, starts a local SMTP stub for the
+confirmation emails, and drives each scenario first through the Flask test
+client (in-process, sequential) and then through a local gunicorn started
+with gunicorn.conf.py (HTTP, concurrent clients). Reports p50/p95/p99
+latency and requests/s, writes the results to benchmarks/results/, and
+compares them with a stored baseline.
+
+    python benchmarks/run.py                       # run and compare
+    python benchmarks/run.py --update-baseline     # run and store as baseline
+    python benchmarks/run.py --skip-gunicorn --only menu.index
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.gunicorn_load import free_port, percentile, start_gunicorn, stop_gunicorn  # noqa: E402
+from benchmarks.smtp_stub import SMTPStub, stub_env  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+STAFF_EMAIL = "bench-staff@example.com"
+STAFF_PASSWORD = "bench-password"
+SETUP_CODE = "bench-setup"
+
+CUSTOMER_FORM = {
+    "customer_name": "Bench Customer",
+    "customer_phone": "9800000000",
+    "customer_email": "customer@example.com",
+}
+
+
+# Failed orders are a flash plus a 302 back to the form, not a 4xx; only a
+# redirect to the success page counts as a placed order.
+ORDER_PLACED = "/orders/success/"
+
+
+class Scenario:
+    def __init__(self, name, method, path, data=None, setup=None, redirect_to=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.setup = setup
+        self.redirect_to = redirect_to
+
+    def failed(self, status: int, location: str) -> bool:
+        if self.redirect_to is not None:
+            return status != 302 or self.redirect_to not in location
+        return status >= 400
+
+    def url(self, state: dict) -> str:
+        return self.path(state) if callable(self.path) else self.path
+
+
+def _fill_cart(client, state):
+    client.request("POST", "/cart/add", {"item_id": "1", "qty": "2"})
+    client.request("POST", "/cart/add", {"item_id": "3", "qty": "1"})
+
+
+SCENARIOS = [
+    Scenario("menu.index", "GET", "/menu"),
+    Scenario("orders.cart_add", "POST", "/cart/add", {"item_id": "2", "qty": "1"}),
+    Scenario("orders.cart_view", "GET", "/cart", setup=_fill_cart),
+    Scenario("orders.cart_confirm", "POST", "/cart/confirm", CUSTOMER_FORM, setup=_fill_cart,
+             redirect_to=ORDER_PLACED),
+    Scenario("staff.create_offline_order", "POST", "/staff/orders/offline",
+             {"items_spec": "1:1;2:2", "payment_mode": "cash"}, redirect_to=ORDER_PLACED),
+    Scenario("staff.invoice_pdf", "GET", lambda st: f"/staff/invoices/{st['order_id']}.pdf"),
+    Scenario("reports.reports_index", "GET", "/staff/reports"),
+    Scenario("orders.order_status", "GET", lambda st: f"/orders/{st['order_id']}"),
+]
+
+
+class FlaskClient:
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method: str, path: str, data=None) -> tuple[int, str]:
+        resp = self._client.open(path, method=method, data=data)
+        return resp.status_code, resp.headers.get("Location", "")
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HTTPClient:
+    def __init__(self, port: int):
+        self._base = f"http://127.0.0.1:{port}"
+        self._opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect()
+        )
+
+    def request(self, method: str, path: str, data=None) -> tuple[int, str]:
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self._base + path, data=body, method=method)
+        try:
+            with self._opener.open(req, timeout=60) as resp:
+                resp.read()
+                return resp.status, resp.headers.get("Location", "")
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code, e.headers.get("Location", "")
+
+
+def _login_staff(client) -> None:
+    client.request("POST", "/login", {"email": STAFF_EMAIL, "password": STAFF_PASSWORD})
+
+
+def _summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def _run_one(clients: list, scenario: Scenario, state: dict, iterations: int, warmup: int) -> dict:
+    """Run ``iterations`` timed requests spread over ``clients`` (one thread each)."""
+    latencies: list[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    url = scenario.url(state)
+
+    def worker(client, count, warm):
+        local, local_errors = [], 0
+        for i in range(warm + count):
+            if scenario.setup:
+                scenario.setup(client, state)
+            start = time.perf_counter()
+            status, location = client.request(scenario.method, url, scenario.data)
+            elapsed = time.perf_counter() - start
+            if i < warm:
+                continue
+            local.append(elapsed)
+            if scenario.failed(status, location):
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    per_client = max(1, iterations // len(clients))
+    warm_per_client = max(1, warmup // len(clients))
+    threads = [threading.Thread(target=worker, args=(c, per_client, warm_per_client)) for c in clients]
+
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # Setup requests are included in the wall time; rps is a lower bound for
+    # scenarios that need a cart refilled before every request.
+    return _summarize(latencies, errors[0], time.perf_counter() - start)
+
+
+def _prepare_database():
+    from app import create_app
+    from extensions import db
+    from seed import seed_data
+
+    app = create_app()
+    with app.app_context():
+        seed_data()
+
+    client = FlaskClient(app)
+    client.request("POST", "/staff/register",
+                   {"email": STAFF_EMAIL, "password": STAFF_PASSWORD, "setup_code": SETUP_CODE})
+    _login_staff(client)
+    client.request("POST", "/staff/orders/offline", {"items_spec": "1:2;2:1;3:1;4:1"})
+
+    with app.app_context():
+        from models import Order
+
+        order_id = db.session.execute(db.select(db.func.max(Order.id))).scalar()
+    return app, {"order_id": order_id}
+
+
+def run_flask(app, state, scenarios, iterations, warmup) -> dict:
+    client = FlaskClient(app)
+    _login_staff(client)
+    return {s.name: _run_one([client], s, state, iterations, warmup) for s in scenarios}
+
+
+def run_gunicorn(env, state, scenarios, iterations, warmup, concurrency) -> dict:
+    port = free_port()
+    proc = start_gunicorn(os.path.join(ROOT, "gunicorn.conf.py"), port, env)
+    try:
+        clients = []
+        for _ in range(concurrency):
+            client = HTTPClient(port)
+            _login_staff(client)
+            clients.append(client)
+        return {s.name: _run_one(clients, s, state, iterations, warmup) for s in scenarios}
+    finally:
+        stop_gunicorn(proc)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Regressions: p95 up, or rps down, by more than ``threshold``."""
+    regressions = []
+    for mode, scenarios in results["results"].items():
+        for name, cur in scenarios.items():
+            base = baseline.get("results", {}).get(mode, {}).get(name)
+            if not base:
+                continue
+            if base["p95_ms"] and cur["p95_ms"] > base["p95_ms"] * (1 + threshold):
+                regressions.append(
+                    f"{mode}/{name}: p95 {base['p95_ms']:.1f} -> {cur['p95_ms']:.1f} ms"
+                )
+            if base["rps"] and cur["rps"] < base["rps"] * (1 - threshold):
+                regressions.append(f"{mode}/{name}: rps {base['rps']:.1f} -> {cur['rps']:.1f}")
+    return regressions
+
+
+def print_table(mode: str, results: dict, baseline: dict) -> None:
+    print(f"\n== {mode}")
+    print(f"{'scenario':<28} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err':>4} {'p95 vs base':>12}")
+    for name, r in results.items():
+        base = baseline.get("results", {}).get(mode, {}).get(name)
+        delta = ""
+        if base and base["p95_ms"]:
+            delta = f"{(r['p95_ms'] / base['p95_ms'] - 1) * 100:+.0f}%"
+        print(f"{name:<28} {r['rps']:>8.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+              f"{r['p99_ms']:>8.2f} {r['errors']:>4} {delta:>12}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8, help="HTTP clients against gunicorn")
+    parser.add_argument("--skip-gunicorn", action="store_true")
+    parser.add_argument("--only", action="append", help="Run only these scenarios")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed fractional regression in p95 or rps (default 0.25)")
+    args = parser.parse_args()
+
+    scenarios = [s for s in SCENARIOS if not args.only or s.name in args.only]
+
+    stub = SMTPStub().start()
+    tmpdir = tempfile.mkdtemp(prefix="cafe_bench_")
+    env = {
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmpdir, 'bench.db')}",
+        "STAFF_SETUP_CODE": SETUP_CODE,
+        "SECRET_KEY": "benchmark-secret-key-not-for-production",
+        "AUTH_RATE_LIMIT_ENABLED": "false",
+        "GUNICORN_ACCESSLOG": "",
+        **stub_env(stub),
+    }
+    # Config reads the environment at import time.
+    os.environ.update(env)
+
+    app, state = _prepare_database()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+        },
+        "results": {},
+    }
+    results["results"]["flask"] = run_flask(app, state, scenarios, args.iterations, args.warmup)
+    if not args.skip_gunicorn:
+        results["results"]["gunicorn"] = run_gunicorn(
+            dict(os.environ), state, scenarios, args.iterations, args.warmup, args.concurrency
+        )
+    results["meta"]["emails_sent"] = stub.messages
+    stub.stop()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    for mode, mode_results in results["results"].items():
+        print_table(mode, mode_results, baseline)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json")
+    with open(out_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {out_path}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("No baseline to compare against (run with --update-baseline to store one).")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%}:")
+        for r in regressions:
+            print(f"  {r}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Minimal local SMTP server that accepts and discards every message.
+
+Speaks just enough of RFC 5321 for ``smtplib.SMTP.login``/``send_message``
+(EHLO advertising AUTH PLAIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT), so the
+ordering paths can send confirmation emails without touching the network.
+"""
+
+import socketserver
+import threading
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self._reply("220 localhost stub ESMTP")
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            verb = raw.decode("latin-1").strip().split(" ", 1)[0].upper()
+
+            if verb in ("EHLO", "HELO"):
+                self.wfile.write(b"250-localhost\r\n250-AUTH PLAIN\r\n250 8BITMIME\r\n")
+            elif verb == "AUTH":
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line == b".\r\n":
+                        break
+                self.server.messages += 1
+                self._reply("250 2.0.0 OK")
+            elif verb == "QUIT":
+                self._reply("221 2.0.0 Bye")
+                return
+            else:
+                self._reply("250 2.0.0 OK")
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _SMTPHandler)
+        self.messages = 0
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> "SMTPStub":
+        self._thread = threading.Thread(target=self.serve_forever, name="smtp-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def stub_env(stub: SMTPStub) -> dict:
+    """Environment that points email_utils at ``stub``."""
+    return {
+        "GMAIL_EMAIL": "bench@example.com",
+        "GMAIL_APP_PASSWORD": "bench",
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(stub.port),
+        "SMTP_USE_SSL": "false",
+    }
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Measure where application start-up time goes.
+
+Runs a fresh interpreter with ``-X importtime`` for each scenario, several
+times, and reports the median wall time plus the modules with the largest
+cumulative import cost. Scenarios:
+
+  import     import app (should build nothing)
+  create     import app and call create_app()
+  worker     create_app() plus the first request to the menu
+  cli        flask --app app --help (what every `flask seed` pays first)
+
+    python benchmarks/startup.py [--runs 5] [--top 15]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "import": "import app",
+    "create": "import app; app.create_app()",
+    "worker": (
+        "import app; a = app.create_app()\n"
+        "from extensions import db\n"
+        "with a.app_context(): db.create_all()\n"
+        "a.test_client().get('/menu')"
+    ),
+    "cli": None,
+}
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+_TIMER = (
+    "import time as _t; _s = _t.perf_counter()\n"
+    "{code}\n"
+    "import sys as _sys; _sys.stdout.write('ELAPSED %f\\n' % (_t.perf_counter() - _s))"
+)
+
+
+def _run(scenario: str, env: dict) -> tuple[float, list[tuple[int, int, str]]]:
+    if scenario == "cli":
+        cmd = [sys.executable, "-X", "importtime", "-m", "flask", "--app", "app", "--help"]
+        code = None
+    else:
+        code = _TIMER.format(code=SCENARIOS[scenario])
+        cmd = [sys.executable, "-X", "importtime", "-c", code]
+
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{scenario} failed:\n{proc.stderr[-2000:]}")
+
+    if code is not None:
+        for line in proc.stdout.splitlines():
+            if line.startswith("ELAPSED "):
+                wall = float(line.split()[1])
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            modules.append((int(m.group(1)), int(m.group(2)), m.group(4)))
+    return wall, modules
+
+
+def _top_level(modules: list[tuple[int, int, str]]) -> dict[str, int]:
+    """Cumulative import cost grouped by top-level package."""
+    totals: dict[str, int] = {}
+    for self_us, _, name in modules:
+        pkg = name.split(".")[0]
+        totals[pkg] = totals.get(pkg, 0) + self_us
+    return totals
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS))
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    tmpdir = tempfile.mkdtemp(prefix="cafe_startup_")
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'startup.db')}"
+
+    for scenario in args.scenarios:
+        walls = []
+        modules = []
+        for _ in range(args.runs):
+            wall, modules = _run(scenario, env)
+            walls.append(wall)
+
+        print(f"== {scenario}: median {statistics.median(walls) * 1000:.1f} ms "
+              f"(min {min(walls) * 1000:.1f}, max {max(walls) * 1000:.1f}) over {args.runs} runs")
+
+        print(f"   {'self ms':>8}  package")
+        by_pkg = sorted(_top_level(modules).items(), key=lambda kv: kv[1], reverse=True)
+        for pkg, self_us in by_pkg[: args.top]:
+            print(f"   {self_us / 1000:>8.1f}  {pkg}")
+        print()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress harness for ordering and inventory correctness.
+
+Starts --processes worker processes, each building its own app against one
+shared database and running online-checkout, manual-order and POS clients
+in threads (Flask test clients, so the full view code and its transactions
+run; only HTTP parsing is skipped). All clients start together and fire
+--requests each as fast as they can. Confirmation emails go to a local SMTP
+stub.
+
+Every order carries a unique customer name, so afterwards the harness can
+match what each client was told against what the database holds, and
+checks:
+
+  * no duplicates: at most one order per request, exactly one if it succeeded
+  * atomicity: failed requests left no order behind
+  * totals: line = unit x qty, subtotal = sum(lines), total = subtotal - discount
+  * stock conservation: final stock = initial stock - POS quantities sold
+
+It prints throughput, latency and error rates (with "database is locked"
+counted separately) per endpoint, and exits 1 if any invariant fails.
+
+    python benchmarks/stress.py --online 50 --pos 10 --manual 5 --processes 2
+    python benchmarks/stress.py --database-url postgresql://... --processes 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.gunicorn_load import percentile  # noqa: E402
+from benchmarks.smtp_stub import SMTPStub, stub_env  # noqa: E402
+
+STAFF_EMAIL = "stress-staff@example.com"
+STAFF_PASSWORD = "stress-password"
+SETUP_CODE = "stress-setup"
+INITIAL_STOCK = 1_000_000  # high enough that the max(0, ...) clamp never hides drift
+ITEM_IDS = (1, 2, 3, 4, 5, 6)
+
+
+def _configure_env(database_url: str, smtp: dict) -> None:
+    # Config reads the environment at import time, in every process.
+    os.environ.update({
+        "DATABASE_URL": database_url,
+        "STAFF_SETUP_CODE": SETUP_CODE,
+        "SECRET_KEY": "stress-secret-key-not-for-production",
+        "AUTH_RATE_LIMIT_ENABLED": "false",
+        "METRICS_ENABLED": "false",
+        **smtp,
+    })
+
+
+def _items_for(seq: int) -> list[tuple[int, int]]:
+    """Deterministic 1-3 line basket; overlapping items maximise row contention."""
+    n = 1 + seq % 3
+    return [(ITEM_IDS[(seq + i) % len(ITEM_IDS)], 1 + (seq + i) % 2) for i in range(n)]
+
+
+def _spec(items) -> str:
+    return ";".join(f"{item_id}:{qty}" for item_id, qty in items)
+
+
+def _online(client, tag, items):
+    for item_id, qty in items:
+        client.post("/cart/add", data={"item_id": item_id, "qty": qty})
+    return client.post("/cart/confirm", data={
+        "customer_name": tag, "customer_phone": "9800000000", "customer_email": "stress@example.com",
+    })
+
+
+def _manual(client, tag, items):
+    return client.post("/manual/order", data={
+        "customer_name": tag, "customer_phone": "9800000000", "items_spec": _spec(items),
+        "mode": "dine-in", "status": "completed",
+    })
+
+
+def _pos(client, tag, items):
+    return client.post("/staff/orders/offline", data={
+        "customer_name": tag, "items_spec": _spec(items), "payment_mode": "cash",
+    })
+
+
+KINDS = {"online": _online, "manual": _manual, "pos": _pos}
+
+
+def _worker_process(proc_index, clients, requests, start_at, queue):
+    """Run ``clients`` [(kind, client_index)] as threads; put outcomes on ``queue``."""
+    from flask import got_request_exception
+
+    from app import create_app
+
+    app = create_app()
+    last_error = threading.local()
+
+    def remember(sender, exception, **extra):
+        last_error.value = f"{type(exception).__name__}: {exception}".splitlines()[0][:200]
+
+    got_request_exception.connect(remember, app)
+
+    outcomes = []
+    lock = threading.Lock()
+
+    def run(kind, index):
+        client = app.test_client()
+        if kind == "pos":
+            client.post("/login", data={"email": STAFF_EMAIL, "password": STAFF_PASSWORD})
+        local = []
+        while time.time() < start_at:
+            time.sleep(0.001)
+        for seq in range(requests):
+            tag = f"stress-{kind}-{proc_index}-{index}-{seq}"
+            items = _items_for(seq + index)
+            last_error.value = None
+            started = time.perf_counter()
+            try:
+                resp = KINDS[kind](client, tag, items)
+                ok = resp.status_code == 302 and "/orders/success/" in resp.headers.get("Location", "")
+                error = None if ok else (last_error.value or f"HTTP {resp.status_code}")
+            except Exception as e:
+                ok, error = False, f"{type(e).__name__}: {e}".splitlines()[0][:200]
+            local.append((kind, tag, ok, error, time.perf_counter() - started, items))
+        with lock:
+            outcomes.extend(local)
+
+    threads = [threading.Thread(target=run, args=c) for c in clients]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    queue.put(outcomes)
+
+
+def _prepare(database_url: str) -> None:
+    from app import create_app
+    from extensions import db
+    from models import InventoryItem
+    from seed import seed_data
+
+    app = create_app()
+    with app.app_context():
+        seed_data()
+        db.session.execute(db.update(InventoryItem).values(stock=INITIAL_STOCK))
+        db.session.commit()
+    app.test_client().post("/staff/register", data={
+        "email": STAFF_EMAIL, "password": STAFF_PASSWORD, "setup_code": SETUP_CODE,
+    })
+
+
+def check_invariants(outcomes) -> list[str]:
+    from sqlalchemy import select
+
+    from app import create_app
+    from extensions import db
+    from models import InventoryItem, Order, OrderItem
+
+    app = create_app()
+    problems = []
+    with app.app_context():
+        orders = db.session.execute(
+            select(Order.id, Order.customer_name, Order.subtotal_cents, Order.discount_cents, Order.total_cents)
+            .where(Order.customer_name.like("stress-%"))
+        ).all()
+        lines = defaultdict(list)
+        for row in db.session.execute(
+            select(OrderItem.order_id, OrderItem.quantity, OrderItem.unit_price_cents, OrderItem.line_total_cents)
+        ):
+            lines[row.order_id].append(row)
+        stock = dict(db.session.execute(select(InventoryItem.menu_item_id, InventoryItem.stock)).all())
+
+    by_tag = Counter(o.customer_name for o in orders)
+    for kind, tag, ok, error, _, _ in outcomes:
+        found = by_tag.get(tag, 0)
+        if found > 1:
+            problems.append(f"duplicate: {tag} stored {found} times")
+        elif ok and found == 0:
+            problems.append(f"lost: {tag} reported success but is not stored")
+        elif not ok and found == 1:
+            problems.append(f"partial: {tag} failed ({error}) but an order was stored")
+
+    for o in orders:
+        order_lines = lines.get(o.id, [])
+        if not order_lines:
+            problems.append(f"order {o.id} has no lines")
+        for line in order_lines:
+            if line.line_total_cents != line.unit_price_cents * line.quantity:
+                problems.append(f"order {o.id}: line total != unit x qty")
+        if o.subtotal_cents != sum(line.line_total_cents for line in order_lines):
+            problems.append(f"order {o.id}: subtotal {o.subtotal_cents} != sum of lines")
+        if o.total_cents != o.subtotal_cents - o.discount_cents:
+            problems.append(f"order {o.id}: total != subtotal - discount")
+
+    # Only POS orders decrement stock; count what the database says was sold.
+    stored = set(by_tag)
+    sold = Counter()
+    for kind, tag, _, _, _, items in outcomes:
+        if kind == "pos" and tag in stored:
+            for item_id, qty in items:
+                sold[item_id] += qty
+    for item_id in ITEM_IDS:
+        expected = INITIAL_STOCK - sold[item_id]
+        if stock.get(item_id) != expected:
+            problems.append(f"stock drift on menu item {item_id}: expected {expected}, found {stock.get(item_id)}")
+
+    return problems
+
+
+def report(outcomes, elapsed: float) -> None:
+    print(f"{'endpoint':<8} {'requests':>8} {'ok':>6} {'errors':>6} {'locked':>6} {'ok/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    errors = Counter()
+    for kind in KINDS:
+        rows = [o for o in outcomes if o[0] == kind]
+        if not rows:
+            continue
+        latencies = sorted(o[4] for o in rows)
+        ok = sum(1 for o in rows if o[2])
+        failed = [o[3] for o in rows if not o[2]]
+        locked = sum(1 for e in failed if "database is locked" in e)
+        errors.update(failed)
+        print(f"{kind:<8} {len(rows):>8} {ok:>6} {len(failed):>6} {locked:>6} {ok / elapsed:>8.1f} "
+              f"{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 95) * 1000:>8.1f} "
+              f"{percentile(latencies, 99) * 1000:>8.1f}")
+    if errors:
+        print("\nErrors:")
+        for message, count in errors.most_common(10):
+            print(f"  {count:>6}  {message}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--online", type=int, default=50, help="Concurrent online checkout clients")
+    parser.add_argument("--pos", type=int, default=10, help="Concurrent POS (offline order) clients")
+    parser.add_argument("--manual", type=int, default=5, help="Concurrent manual order clients")
+    parser.add_argument("--requests", type=int, default=20, help="Orders per client")
+    parser.add_argument("--processes", type=int, default=2, help="Clients are spread over this many processes")
+    parser.add_argument("--database-url", help="Default: a fresh temporary SQLite file")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='cafe_stress_'), 'stress.db')}"
+    stub = SMTPStub().start()
+    _configure_env(database_url, stub_env(stub))
+    _prepare(database_url)
+
+    clients = (
+        [("online", i) for i in range(args.online)]
+        + [("pos", i) for i in range(args.pos)]
+        + [("manual", i) for i in range(args.manual)]
+    )
+    per_process = [clients[p::args.processes] for p in range(args.processes)]
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    # Leave time for every process to import and build its app before the start line.
+    start_at = time.time() + 3 + args.processes
+    procs = [
+        ctx.Process(target=_worker_process, args=(p, chunk, args.requests, start_at, queue))
+        for p, chunk in enumerate(per_process) if chunk
+    ]
+    for p in procs:
+        p.start()
+    outcomes = []
+    for _ in procs:
+        outcomes.extend(queue.get())
+    elapsed = time.time() - start_at
+    for p in procs:
+        p.join()
+    stub.stop()
+
+    print(f"{len(clients)} clients x {args.requests} requests over {len(procs)} processes in {elapsed:.1f}s "
+          f"({database_url.split(':', 1)[0]})\n")
+    report(outcomes, elapsed)
+
+    problems = check_invariants(outcomes)
+    if problems:
+        print(f"\nInvariant violations ({len(problems)}):")
+        for p in problems[:50]:
+            print(f"  {p}")
+        return 1
+    print("\nAll invariants hold.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: the compiled form schemas the blueprints use vs what they replaced.
+
+  * checkout: ``orders.CART_CONFIRM_FORM`` vs ``utils.sanitize_form_data``
+    with the same rules;
+  * pos: ``staff.OFFLINE_ORDER_FORM`` vs the inline strip()/int() parsing
+    and string-splitting ``parse_items_spec`` the counter view used before.
+
+Reports the per-call cost of each. Run:
+
+    python benchmarks/validators.py [--number 200000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from blueprints.orders import CART_CONFIRM_FORM, CUSTOMER_FIELDS
+from blueprints.staff import OFFLINE_ORDER_FORM
+from utils import sanitize_form_data
+
+CHECKOUT_RULES = {
+    **CUSTOMER_FIELDS,
+    "customer_email": {"type": "email", "required": True, "max_length": 255},
+    "coupon_code": {"type": "string", "max_length": 50},
+}
+CHECKOUT_FORM = {
+    "customer_name": "  Ananya Iyer ",
+    "customer_phone": "+91 98000 00000",
+    "customer_email": "ananya.iyer@example.com",
+    "coupon_code": "FUSION10",
+}
+
+POS_FORM = {
+    "items_spec": "3:2;7:1;12:4",
+    "payment_mode": "upi",
+    "discount_cents": "500",
+    "customer_name": "Kabir Das",
+    "customer_phone": "",
+}
+
+
+def _legacy_items_spec(spec: str) -> list[tuple[int, int]]:
+    if not spec:
+        return []
+    parts = [p.strip() for p in spec.split(";") if p.strip()]
+    items = []
+    for p in parts:
+        if ":" not in p:
+            raise ValueError("Invalid format. Use item_id:qty;item_id:qty")
+        item_id_s, qty_s = [x.strip() for x in p.split(":", 1)]
+        item_id = int(item_id_s)
+        qty = int(qty_s)
+        if qty <= 0:
+            raise ValueError("Quantity must be >= 1")
+        items.append((item_id, qty))
+    return items
+
+
+def _legacy_pos(form) -> dict:
+    discount_cents_str = (form.get("discount_cents") or "0").strip()
+    try:
+        discount_cents = int(discount_cents_str)
+    except Exception:
+        discount_cents = 0
+    return {
+        "items_spec": _legacy_items_spec(form.get("items_spec") or ""),
+        "payment_mode": form.get("payment_mode") or "cash",
+        "discount_cents": discount_cents,
+        "customer_name": (form.get("customer_name") or "").strip() or "Walk-in",
+        "customer_phone": (form.get("customer_phone") or "").strip() or "-",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'payload':<10} {'before':>12} {'compiled':>12} {'speedup':>8}")
+    for name, before, compiled, form in (
+        ("checkout", lambda f: sanitize_form_data(f, CHECKOUT_RULES), CART_CONFIRM_FORM, CHECKOUT_FORM),
+        ("pos", _legacy_pos, OFFLINE_ORDER_FORM, POS_FORM),
+    ):
+        assert compiled(form) == before(form)
+
+        legacy = min(timeit.repeat(lambda: before(form), number=args.number, repeat=3))
+        fast = min(timeit.repeat(lambda: compiled(form), number=args.number, repeat=3))
+        per_call = 1e6 / args.number
+        print(f"{name:<10} {legacy * per_call:>9.2f} us {fast * per_call:>9.2f} us {legacy / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
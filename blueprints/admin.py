@@ -1,11 +1,30 @@
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 
 from auth_utils import login_required
+from cache_utils import bump_version, get_menu_items
 from extensions import db
-from models import MenuItem
+from menu_bulk import parse_menu_file, set_availability, upsert_menu_items
+from models import MAX_INTEGER, MenuItem
+from utils import compile_form_schema
 
 bp = Blueprint("admin", __name__, url_prefix="/staff")
 
+MENU_ADD_FORM = compile_form_schema({
+    "name": {"type": "string", "required": True, "max_length": 255},
+    "category": {"type": "string", "required": True, "max_length": 100},
+    "price_cents": {"type": "integer", "required": True, "min": 0, "label": "Price"},
+    "is_available_online": {"type": "bool"},
+    "is_available_offline": {"type": "bool"},
+})
+
+AVAILABILITY_FORM = compile_form_schema({
+    "ids": {"type": "string"},
+    "category": {"type": "string", "max_length": 100},
+    "tag": {"type": "string", "max_length": 50},
+    "online": {"type": "choice", "choices": ("on", "off")},
+    "offline": {"type": "choice", "choices": ("on", "off")},
+})
+
 
 @bp.get("/menu/add")
 @login_required(role="staff")
@@ -16,31 +35,77 @@ def menu_add_form():
 @bp.post("/menu/add")
 @login_required(role="staff")
 def menu_add_post():
-    name = request.form.get("name", "").strip()
-    category = request.form.get("category", "").strip()
-    price_cents = request.form.get("price_cents")
-    online = bool(request.form.get("is_available_online"))
-    offline = bool(request.form.get("is_available_offline"))
-
-    if not name or not category or not price_cents:
-        flash("All fields are required.", "warning")
-        return redirect(url_for("admin.menu_add_form"))
-
     try:
-        price_cents_int = int(price_cents)
-    except Exception:
-        flash("Invalid price.", "danger")
+        form = MENU_ADD_FORM(request.form)
+    except ValueError as e:
+        flash(str(e), "danger")
         return redirect(url_for("admin.menu_add_form"))
 
-    mi = MenuItem(
-        name=name,
-        category=category,
-        price_cents=price_cents_int,
-        is_available_online=online,
-        is_available_offline=offline,
-    )
+    mi = MenuItem(**form)
     db.session.add(mi)
+    bump_version("menu")
     db.session.commit()
 
-    flash(f"Added {name}.", "success")
+    flash(f"Added {mi.name}.", "success")
     return redirect(url_for("menu.index"))
+
+
+@bp.get("/menu/bulk")
+@login_required(role="staff")
+def menu_bulk_form():
+    categories = sorted({i.category for i in get_menu_items()})
+    return render_template("admin/menu_bulk.html", categories=categories)
+
+
+@bp.post("/menu/import")
+@login_required(role="staff")
+def menu_import():
+    upload = request.files.get("menu_file")
+    if upload is None or not upload.filename:
+        flash("Choose a CSV or JSON file.", "danger")
+        return redirect(url_for("admin.menu_bulk_form"))
+
+    fmt = upload.filename.rsplit(".", 1)[-1].lower()
+    try:
+        rows = parse_menu_file(upload.read().decode("utf-8-sig"), fmt)
+        inserted, updated = upsert_menu_items(rows)
+    except (ValueError, UnicodeDecodeError) as e:
+        db.session.rollback()
+        flash(str(e), "danger")
+        return redirect(url_for("admin.menu_bulk_form"))
+
+    flash(f"Imported menu: {inserted} added, {updated} updated.", "success")
+    return redirect(url_for("admin.menu_bulk_form"))
+
+
+def _parse_ids(raw: str) -> list[int]:
+    try:
+        ids = [int(i) for i in raw.replace(",", " ").split()]
+    except ValueError:
+        raise ValueError("Invalid ids.") from None
+    if not all(1 <= i <= MAX_INTEGER for i in ids):
+        raise ValueError("Invalid ids.")
+    return ids
+
+
+@bp.post("/menu/availability")
+@login_required(role="staff")
+def menu_availability():
+    try:
+        form = AVAILABILITY_FORM(request.form)
+        ids = _parse_ids(form["ids"])
+        flags = {"on": True, "off": False}
+        count = set_availability(
+            ids=ids,
+            category=form["category"],
+            tag=form["tag"],
+            online=flags.get(form["online"]),
+            offline=flags.get(form["offline"]),
+        )
+    except ValueError as e:
+        db.session.rollback()
+        flash(str(e), "danger")
+        return redirect(url_for("admin.menu_bulk_form"))
+
+    flash(f"Updated availability of {count} item(s).", "success")
+    return redirect(url_for("admin.menu_bulk_form"))
@@ -1,13 +1,30 @@
 from flask import Blueprint, current_app, flash, redirect, render_template, request, session, url_for
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from config import Config
 from extensions import db
 from models import User
 from email_utils import send_welcome_email
+from rate_limit import HashingSaturated, hash_password, service_unavailable, throttle_auth, verify_password
+from utils import compile_form_schema, logger
 
 bp = Blueprint("auth", __name__)
 
+LOGIN_FORM = compile_form_schema({
+    "email": {"type": "string", "lower": True, "max_length": 255},
+    "password": {"type": "raw"},
+})
+
+REGISTER_FORM = compile_form_schema({
+    "email": {"type": "email", "required": True, "lower": True, "max_length": 255},
+    "password": {"type": "raw", "required": True},
+})
+
+
+@bp.errorhandler(HashingSaturated)
+def hashing_saturated(e):
+    current_app.logger.warning("Password hashing saturated; shedding auth request")
+    return service_unavailable(e.retry_after)
+
 
 @bp.get("/login")
 def login():
@@ -15,15 +32,20 @@ def login():
 
 
 @bp.post("/login")
+@throttle_auth
 def login_post():
-    email = (request.form.get("email") or "").strip().lower()
-    password = request.form.get("password") or ""
+    form = LOGIN_FORM(request.form)
+    email, password = form["email"], form["password"]
 
     user = User.query.filter_by(email=email).first()
-    if not user or not check_password_hash(user.password_hash, password):
+    if not user or not verify_password(user.password_hash, password):
+        logger.log_auth(user.id if user else None, "login", email, False,
+                        {"ip": request.remote_addr})
         flash("Invalid email or password.", "danger")
         return redirect(url_for("auth.login"))
 
+    logger.log_auth(user.id, "login", email, True, {"ip": request.remote_addr})
+
     session.clear()
     session["user_id"] = user.id
     session["email"] = user.email
@@ -45,13 +67,14 @@ def register():
 
 
 @bp.post("/register")
+@throttle_auth
 def register_post():
-    email = (request.form.get("email") or "").strip().lower()
-    password = request.form.get("password") or ""
-
-    if not email or not password:
-        flash("Email and password are required.", "warning")
+    try:
+        form = REGISTER_FORM(request.form)
+    except ValueError as e:
+        flash(str(e), "warning")
         return redirect(url_for("auth.register"))
+    email, password = form["email"], form["password"]
 
     if User.query.filter_by(email=email).first() is not None:
         flash("That email is already registered.", "warning")
@@ -59,11 +82,12 @@ def register_post():
 
     user = User(
         email=email,
-        password_hash=generate_password_hash(password),
+        password_hash=hash_password(password),
         role="customer",
     )
     db.session.add(user)
     db.session.commit()
+    logger.log_auth(user.id, "register", email, True, {"role": "customer"})
 
     try:
         # Use the part before @ in email as name if name is not available
@@ -71,6 +95,7 @@ def register_post():
         send_welcome_email(user.email, username, role="customer")
     except Exception as e:
         current_app.logger.error(f"Failed to send welcome email: {e}", exc_info=True)
+        logger.log_error(e, {"user_id": user.id, "action": "welcome_email"})
 
     flash("Account created. Please log in.", "success")
     return redirect(url_for("auth.login"))
@@ -82,18 +107,22 @@ def staff_register():
 
 
 @bp.post("/staff/register")
+@throttle_auth
 def staff_register_post():
-    email = (request.form.get("email") or "").strip().lower()
-    password = request.form.get("password") or ""
     setup_code = request.form.get("setup_code") or ""
 
     if setup_code != Config.STAFF_SETUP_CODE:
+        logger.log_auth(None, "staff_register", (request.form.get("email") or "").strip().lower(), False,
+                        {"reason": "bad_setup_code", "ip": request.remote_addr})
         flash("Invalid staff setup code.", "danger")
         return redirect(url_for("auth.staff_register"))
 
-    if not email or not password:
-        flash("Email and password are required.", "warning")
+    try:
+        form = REGISTER_FORM(request.form)
+    except ValueError as e:
+        flash(str(e), "warning")
         return redirect(url_for("auth.staff_register"))
+    email, password = form["email"], form["password"]
 
     if User.query.filter_by(email=email).first() is not None:
         flash("That email is already registered.", "warning")
@@ -101,11 +130,12 @@ def staff_register_post():
 
     user = User(
         email=email,
-        password_hash=generate_password_hash(password),
+        password_hash=hash_password(password),
         role="staff",
     )
     db.session.add(user)
     db.session.commit()
+    logger.log_auth(user.id, "register", email, True, {"role": "staff"})
 
     try:
         # Use the part before @ in email as name
@@ -113,6 +143,7 @@ def staff_register_post():
         send_welcome_email(user.email, username, role="staff")
     except Exception as e:
         current_app.logger.error(f"Failed to send welcome email: {e}", exc_info=True)
+        logger.log_error(e, {"user_id": user.id, "action": "welcome_email"})
 
     flash("Staff account created. Please log in.", "success")
     return redirect(url_for("auth.login"))
@@ -120,6 +151,8 @@ def staff_register_post():
 
 @bp.post("/logout")
 def logout():
+    if session.get("user_id"):
+        logger.log_auth(session["user_id"], "logout", session.get("email"), True)
     session.clear()
     flash("Logged out.", "info")
     return redirect(url_for("menu.index"))
@@ -0,0 +1,22 @@
+from flask import Blueprint, jsonify
+
+from health_checks import READINESS_CHECKS, get_overall_health
+
+bp = Blueprint("health", __name__)
+
+
+@bp.get("/healthz")
+def healthz():
+    # Liveness: the process is up and serving requests. No I/O on purpose.
+    return jsonify(status="ok")
+
+
+@bp.get("/readyz")
+def readyz():
+    health = get_overall_health(READINESS_CHECKS, critical_only=True)
+    checks = {
+        c.service_name: {"ok": c.status, "message": c.message, "details": c.details}
+        for c in health["checks"]
+    }
+    body = {"status": health["status"], "timestamp": health["timestamp"], "checks": checks}
+    return jsonify(body), 200 if health["status"] == "healthy" else 503
@@ -4,10 +4,29 @@ from flask import Blueprint, flash, redirect, render_template, request, url_for
 
 from auth_utils import login_required
 from extensions import db
-from models import InventoryItem
+from inventory_bulk import MODES, apply_stock_changes, parse_stock_lines
+from models import InventoryItem, MenuItem, RecipeComponent
+from recipes import menu_items_using, parse_recipe_lines, replace_recipes
+from stock_watch import disable_menu_items, low_stock_items, set_stock
+from utils import compile_form_schema
 
 bp = Blueprint("inventory", __name__, url_prefix="/staff")
 
+INVENTORY_UPDATE_FORM = compile_form_schema({
+    "item_id": {"type": "integer", "required": True, "label": "Item"},
+    "stock": {"type": "integer", "required": True},
+    "reorder_threshold": {"type": "integer", "min": 0, "label": "Reorder threshold"},
+})
+
+INVENTORY_BULK_FORM = compile_form_schema({
+    "mode": {"type": "choice", "choices": MODES, "default": "set"},
+    "rows": {"type": "raw"},
+})
+
+RECIPES_FORM = compile_form_schema({
+    "rows": {"type": "raw"},
+})
+
 
 @bp.get("/inventory")
 @login_required(role="staff")
@@ -16,27 +35,87 @@ def inventory_list():
     return render_template("inventory/list.html", rows=rows)
 
 
+@bp.get("/inventory/low")
+@login_required(role="staff")
+def low_stock():
+    return render_template("inventory/low_stock.html", rows=low_stock_items())
+
+
 @bp.post("/inventory/update")
 @login_required(role="staff")
 def inventory_update():
-    item_id = request.form.get("item_id")
-    stock = request.form.get("stock")
-
     try:
-        item_id_int = int(item_id)
-        stock_int = int(stock)
-    except Exception:
-        flash("Invalid input.", "danger")
+        form = INVENTORY_UPDATE_FORM(request.form)
+    except ValueError as e:
+        flash(str(e), "danger")
         return redirect(url_for("inventory.inventory_list"))
 
-    row = InventoryItem.query.get(item_id_int)
+    row = InventoryItem.query.get(form["item_id"])
     if row is None:
         flash("Inventory item not found.", "danger")
         return redirect(url_for("inventory.inventory_list"))
 
-    row.stock = max(0, stock_int)
+    if form["reorder_threshold"] is not None:
+        row.reorder_threshold = form["reorder_threshold"]
+    if set_stock(row, max(0, form["stock"])):
+        disable_menu_items(menu_items_using([row.id]))
     row.last_restock = datetime.utcnow()
     db.session.commit()
 
     flash("Stock updated.", "success")
     return redirect(url_for("inventory.inventory_list"))
+
+
+@bp.post("/inventory/bulk")
+@login_required(role="staff")
+def inventory_bulk():
+    try:
+        form = INVENTORY_BULK_FORM(request.form)
+        upload = request.files.get("stock_file")
+        text = upload.read().decode("utf-8-sig") if upload and upload.filename else form["rows"]
+        updated, unknown = apply_stock_changes(parse_stock_lines(text), form["mode"])
+    except (ValueError, UnicodeDecodeError) as e:
+        db.session.rollback()
+        flash(str(e), "danger")
+        return redirect(url_for("inventory.inventory_list"))
+
+    flash(f"Stock updated for {updated} item(s).", "success")
+    if unknown:
+        shown = ", ".join(map(str, unknown[:20])) + (" ..." if len(unknown) > 20 else "")
+        flash(f"Unknown item ids skipped: {shown}", "warning")
+    return redirect(url_for("inventory.inventory_list"))
+
+
+@bp.get("/inventory/recipes")
+@login_required(role="staff")
+def recipes():
+    rows = db.session.execute(
+        db.select(
+            MenuItem.id.label("menu_item_id"),
+            MenuItem.name.label("menu_item"),
+            InventoryItem.id.label("inventory_item_id"),
+            InventoryItem.name.label("ingredient"),
+            RecipeComponent.quantity,
+        )
+        .join(MenuItem, MenuItem.id == RecipeComponent.menu_item_id)
+        .join(InventoryItem, InventoryItem.id == RecipeComponent.inventory_item_id)
+        .order_by(MenuItem.name.asc(), InventoryItem.name.asc())
+    ).all()
+    return render_template("inventory/recipes.html", rows=rows)
+
+
+@bp.post("/inventory/recipes")
+@login_required(role="staff")
+def recipes_import():
+    try:
+        form = RECIPES_FORM(request.form)
+        upload = request.files.get("recipe_file")
+        text = upload.read().decode("utf-8-sig") if upload and upload.filename else form["rows"]
+        count = replace_recipes(parse_recipe_lines(text))
+    except (ValueError, UnicodeDecodeError) as e:
+        db.session.rollback()
+        flash(str(e), "danger")
+        return redirect(url_for("inventory.recipes"))
+
+    flash(f"Saved {count} recipe component(s).", "success")
+    return redirect(url_for("inventory.recipes"))
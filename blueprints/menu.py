@@ -1,30 +1,51 @@
 from collections import defaultdict
 
-from flask import Blueprint, render_template, request
+from flask import Blueprint, jsonify, render_template, request
 
-from models import MenuItem
+from cache_utils import get_menu_snapshot
+from menu_search import search_menu
 
 bp = Blueprint("menu", __name__)
 
+MODE_FILTERS = {
+    "online": lambda i: i.is_available_online,
+    "offline": lambda i: i.is_available_offline,
+    "all": None,
+}
 
-@bp.get("/")
-@bp.get("/menu")
-def index():
+
+def _mode() -> str:
     mode = (request.args.get("mode") or "online").lower()
+    return mode if mode in MODE_FILTERS else "all"
 
-    q = MenuItem.query
 
-    if mode == "online":
-        q = q.filter(MenuItem.is_available_online.is_(True))
-    elif mode == "offline":
-        q = q.filter(MenuItem.is_available_offline.is_(True))
-    else:
-        mode = "all"
+@bp.get("/")
+@bp.get("/menu")
+def index():
+    mode = _mode()
 
-    items = q.order_by(MenuItem.category.asc(), MenuItem.name.asc()).all()
+    # The fragment cache key needs the version these items came from.
+    version, items = get_menu_snapshot()
+    keep = MODE_FILTERS[mode]
+    if keep is not None:
+        items = [i for i in items if keep(i)]
 
     grouped = defaultdict(list)
     for item in items:
         grouped[item.category].append(item)
 
-    return render_template("menu/index.html", grouped=grouped, mode=mode)
+    return render_template("menu/index.html", grouped=grouped, mode=mode, items_version=version)
+
+
+@bp.get("/menu/search")
+def search():
+    mode = _mode()
+    query = (request.args.get("q") or "").strip()[:100]
+    results = search_menu(query, limit=50, predicate=MODE_FILTERS[mode])
+
+    if request.accept_mimetypes.best == "application/json":
+        return jsonify(query=query, results=[
+            {"id": i.id, "name": i.name, "category": i.category, "price_cents": i.price_cents}
+            for i in results
+        ])
+    return render_template("menu/search.html", query=query, results=results, mode=mode)
@@ -1,14 +1,48 @@
 from datetime import datetime
 
-from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for
+from flask import Blueprint, current_app, flash, redirect, render_template, request, session, url_for
 
-from cart_utils import clear_cart, get_cart, parse_items_spec, set_cart
+from cache_utils import get_active_coupon
+from cart_utils import clear_cart, get_cart, set_cart
 from extensions import db
-from models import Coupon, MenuItem, Order, OrderItem
+from loader_profiles import load_order
+from metrics import record_order_created
+from models import MenuItem, Order, OrderItem
 from email_utils import send_order_confirmation_email
+from utils import compile_form_schema, logger
 
 bp = Blueprint("orders", __name__)
 
+CART_ADD_FORM = compile_form_schema({
+    "item_id": {"type": "integer", "required": True, "label": "Item"},
+    "qty": {"type": "quantity", "default": 1, "label": "Quantity"},
+})
+
+CUSTOMER_FIELDS = {
+    "customer_name": {"type": "string", "required": True, "max_length": 255},
+    "customer_phone": {"type": "phone", "required": True, "max_length": 50},
+}
+
+CART_CONFIRM_FORM = compile_form_schema({
+    **CUSTOMER_FIELDS,
+    "customer_email": {"type": "email", "required": True, "max_length": 255},
+    "coupon_code": {"type": "string", "max_length": 50},
+})
+
+MANUAL_ORDER_FORM = compile_form_schema({
+    **CUSTOMER_FIELDS,
+    "customer_email": {"type": "email", "max_length": 255},
+    "mode": {"type": "choice", "choices": ("dine-in", "takeaway", "delivery"), "default": "dine-in"},
+    "payment_mode": {"type": "choice", "choices": ("cash", "card", "upi"), "default": "cash"},
+    "status": {
+        "type": "choice",
+        "choices": ("pending", "confirmed", "completed", "cancelled"),
+        "default": "pending",
+    },
+    "items_spec": {"type": "item_spec"},
+    "coupon_code": {"type": "string", "max_length": 50},
+})
+
 
 def _compute_totals(cart_items: list[tuple[MenuItem, int]], coupon_code: str | None):
     subtotal_cents = sum(item.price_cents * qty for item, qty in cart_items)
@@ -18,7 +52,7 @@ def _compute_totals(cart_items: list[tuple[MenuItem, int]], coupon_code: str | N
 
     if coupon_code:
         code = coupon_code.strip().upper()
-        coupon = Coupon.query.filter_by(code=code, is_active=True).first()
+        coupon = get_active_coupon(code)
         if coupon is None:
             raise ValueError("Invalid coupon code")
         if subtotal_cents < coupon.min_order_cents:
@@ -37,19 +71,13 @@ def _compute_totals(cart_items: list[tuple[MenuItem, int]], coupon_code: str | N
 
 @bp.post("/cart/add")
 def cart_add():
-    item_id = request.form.get("item_id")
-    qty = request.form.get("qty") or "1"
-
     try:
-        item_id_int = int(item_id)
-        qty_int = int(qty)
-    except Exception:
-        flash("Invalid item or quantity.", "danger")
+        form = CART_ADD_FORM(request.form)
+    except ValueError as e:
+        flash(str(e), "danger")
         return redirect(url_for("menu.index"))
 
-    if qty_int <= 0:
-        flash("Quantity must be at least 1.", "warning")
-        return redirect(url_for("menu.index"))
+    item_id_int, qty_int = form["item_id"], form["qty"]
 
     item = MenuItem.query.get(item_id_int)
     if item is None:
@@ -101,13 +129,10 @@ def cart_confirm():
         flash("Your cart is empty.", "warning")
         return redirect(url_for("orders.cart_view"))
 
-    customer_name = (request.form.get("customer_name") or "").strip()
-    customer_phone = (request.form.get("customer_phone") or "").strip()
-    customer_email = (request.form.get("customer_email") or "").strip()
-    coupon_code = (request.form.get("coupon_code") or "").strip()
-
-    if not all([customer_name, customer_phone, customer_email]):
-        flash("Customer name, phone, and email are required.", "warning")
+    try:
+        form = CART_CONFIRM_FORM(request.form)
+    except ValueError as e:
+        flash(str(e), "warning")
         return redirect(url_for("orders.cart_view"))
 
     ids = [int(k) for k in cart.keys()]
@@ -127,16 +152,16 @@ def cart_confirm():
 
     try:
         subtotal_cents, discount_cents, total_cents, applied_code = _compute_totals(
-            cart_items, coupon_code or None
+            cart_items, form["coupon_code"] or None
         )
     except ValueError as e:
         flash(str(e), "danger")
         return redirect(url_for("orders.cart_view"))
 
     order = Order(
-        customer_name=customer_name,
-        customer_phone=customer_phone,
-        customer_email=customer_email,
+        customer_name=form["customer_name"],
+        customer_phone=form["customer_phone"],
+        customer_email=form["customer_email"],
         mode="online",
         status="pending",
         subtotal_cents=subtotal_cents,
@@ -156,16 +181,26 @@ def cart_confirm():
                 quantity=qty,
                 unit_price_cents=unit,
                 line_total_cents=line_total,
+                item_name=mi.name,
+                item_category=mi.category,
             )
         )
 
     db.session.add(order)
     db.session.commit()
+    record_order_created(order.mode)
+    logger.log_order(
+        order.id,
+        "created",
+        user_id=session.get("user_id"),
+        details={"mode": order.mode, "total_cents": total_cents, "lines": len(cart_items)},
+    )
 
     try:
-        send_order_confirmation_email(order)
+        send_order_confirmation_email(load_order(order.id, "order_detail"))
     except Exception as e:
         current_app.logger.error(f"Failed to send order confirmation email: {e}")
+        logger.log_error(e, {"order_id": order.id, "action": "confirmation_email"})
 
     clear_cart()
     return redirect(url_for("orders.success", order_id=order.id))
@@ -173,7 +208,7 @@ def cart_confirm():
 
 @bp.get("/orders/success/<int:order_id>")
 def success(order_id: int):
-    order = Order.query.get(order_id)
+    order = load_order(order_id, "order_summary")
     if order is None:
         flash("Order not found.", "danger")
         return redirect(url_for("menu.index"))
@@ -199,7 +234,7 @@ def track_form():
 
 @bp.get("/orders/<int:order_id>")
 def order_status(order_id: int):
-    order = Order.query.get(order_id)
+    order = load_order(order_id, "order_detail")
     if order is None:
         return render_template("orders/not_found.html", order_id=order_id), 404
 
@@ -220,24 +255,13 @@ def manual_order_form():
 
 @bp.post("/manual/order")
 def manual_order_post():
-    data = request.form
-    customer_name = (data.get("customer_name") or "").strip()
-    customer_phone = (data.get("customer_phone") or "").strip()
-    customer_email = (data.get("customer_email") or "").strip()
-    mode = data.get("mode", "dine-in")
-    payment_mode = data.get("payment_mode", "cash")
-    status = data.get("status", "pending")
-
-    if not customer_name or not customer_phone:
-        flash("Customer name and phone are required.", "warning")
-        return redirect(url_for("orders.manual_order_form"))
-
     try:
-        pairs = parse_items_spec(data.get("items_spec") or "")
+        form = MANUAL_ORDER_FORM(request.form)
     except ValueError as e:
         flash(str(e), "danger")
         return redirect(url_for("orders.manual_order_form"))
 
+    pairs = form["items_spec"]
     if not pairs:
         flash("No items provided.", "warning")
         return redirect(url_for("orders.manual_order_form"))
@@ -259,23 +283,23 @@ def manual_order_post():
 
     try:
         subtotal_cents, discount_cents, total_cents, applied_code = _compute_totals(
-            cart_items, data.get("coupon_code") or None
+            cart_items, form["coupon_code"] or None
         )
     except ValueError as e:
         flash(str(e), "danger")
         return redirect(url_for("orders.manual_order_form"))
 
     order = Order(
-        customer_name=customer_name,
-        customer_phone=customer_phone,
-        customer_email=customer_email,
-        mode=mode,
-        status=status,
+        customer_name=form["customer_name"],
+        customer_phone=form["customer_phone"],
+        customer_email=form["customer_email"],
+        mode=form["mode"],
+        status=form["status"],
         subtotal_cents=subtotal_cents,
         discount_cents=discount_cents,
         total_cents=total_cents,
         coupon_code=applied_code,
-        payment_mode=payment_mode,
+        payment_mode=form["payment_mode"],
         created_at=datetime.utcnow(),
     )
 
@@ -288,17 +312,27 @@ def manual_order_post():
                 quantity=qty,
                 unit_price_cents=unit,
                 line_total_cents=line_total,
+                item_name=mi.name,
+                item_category=mi.category,
             )
         )
 
     db.session.add(order)
     db.session.commit()
+    record_order_created(order.mode)
+    logger.log_order(
+        order.id,
+        "created",
+        user_id=session.get("user_id"),
+        details={"mode": order.mode, "total_cents": total_cents, "lines": len(cart_items)},
+    )
 
-    if customer_email:
+    if order.customer_email:
         try:
-            send_order_confirmation_email(order)
+            send_order_confirmation_email(load_order(order.id, "order_detail"))
         except Exception as e:
             current_app.logger.error(f"Failed to send order confirmation email: {e}")
+            logger.log_error(e, {"order_id": order.id, "action": "confirmation_email"})
 
     flash(f"Order #{order.id} created successfully.", "success")
     return redirect(url_for("orders.success", order_id=order.id))
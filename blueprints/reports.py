@@ -1,9 +1,12 @@
-from flask import Blueprint, render_template
+import os
+
+from flask import Blueprint, abort, current_app, render_template, send_from_directory
 from sqlalchemy import func
 
 from auth_utils import login_required
 from extensions import db
 from models import Order
+from profiling import PROFILE_HEADER, list_captures, make_profile_token, profile_dir
 
 bp = Blueprint("reports", __name__, url_prefix="/staff")
 
@@ -41,3 +44,24 @@ def reports_index():
         mode_counts=mode_counts,
         status_counts=status_counts,
     )
+
+
+@bp.get("/profiles")
+@login_required(role="staff")
+def profiles_index():
+    if not current_app.config["PROFILING_ENABLED"]:
+        abort(404)
+    return render_template(
+        "reports/profiles.html",
+        captures=list_captures(),
+        header=PROFILE_HEADER,
+        token=make_profile_token(),
+    )
+
+
+@bp.get("/profiles/<path:name>")
+@login_required(role="staff")
+def profile_download(name: str):
+    if not current_app.config["PROFILING_ENABLED"] or not name.endswith(".prof"):
+        abort(404)
+    return send_from_directory(os.path.abspath(profile_dir()), name, as_attachment=True)
@@ -1,17 +1,28 @@
+import time
 from datetime import datetime
 from io import BytesIO
 
-from flask import Blueprint, flash, make_response, redirect, render_template, request, url_for
+from flask import Blueprint, flash, make_response, redirect, render_template, request, session, url_for
 from sqlalchemy import func
-from xhtml2pdf import pisa
 
 from auth_utils import login_required
-from cart_utils import parse_items_spec
 from extensions import db
-from models import InventoryItem, MenuItem, Order, OrderItem
+from loader_profiles import load_order
+from metrics import INVOICE_RENDER, record_order_created
+from models import MenuItem, Order, OrderItem
+from recipes import deplete_inventory
+from utils import compile_form_schema, logger
 
 bp = Blueprint("staff", __name__, url_prefix="/staff")
 
+OFFLINE_ORDER_FORM = compile_form_schema({
+    "items_spec": {"type": "item_spec"},
+    "payment_mode": {"type": "choice", "choices": ("cash", "card", "upi"), "default": "cash"},
+    "discount_cents": {"type": "integer", "default": 0, "label": "Discount"},
+    "customer_name": {"type": "string", "max_length": 255, "default": "Walk-in"},
+    "customer_phone": {"type": "string", "max_length": 50, "default": "-"},
+})
+
 
 @bp.get("/orders")
 @login_required(role="staff")
@@ -35,6 +46,7 @@ def confirm_order(order_id: int):
 
     order.status = "confirmed"
     db.session.commit()
+    logger.log_order(order.id, "confirmed", user_id=session.get("user_id"))
 
     flash(f"Order #{order.id} confirmed.", "success")
     return redirect(url_for("staff.orders"))
@@ -50,6 +62,7 @@ def cancel_order(order_id: int):
 
     order.status = "cancelled"
     db.session.commit()
+    logger.log_order(order.id, "cancelled", user_id=session.get("user_id"))
 
     flash(f"Order #{order.id} cancelled.", "warning")
     return redirect(url_for("staff.orders"))
@@ -64,26 +77,14 @@ def counter_form():
 @bp.post("/orders/offline")
 @login_required(role="staff")
 def create_offline_order():
-    spec = request.form.get("items_spec") or ""
-    payment_mode = request.form.get("payment_mode") or "cash"
-    discount_cents_str = (request.form.get("discount_cents") or "0").strip()
-    customer_name = (request.form.get("customer_name") or "").strip() or "Walk-in"
-    customer_phone = (request.form.get("customer_phone") or "").strip() or "-"
-
-    try:
-        discount_cents = int(discount_cents_str)
-    except Exception:
-        discount_cents = 0
-
-    if discount_cents < 0:
-        discount_cents = 0
-
     try:
-        pairs = parse_items_spec(spec)
+        form = OFFLINE_ORDER_FORM(request.form)
     except ValueError as e:
         flash(str(e), "danger")
         return redirect(url_for("staff.counter_form"))
 
+    discount_cents = max(0, form["discount_cents"])
+    pairs = form["items_spec"]
     if not pairs:
         flash("No items provided.", "warning")
         return redirect(url_for("staff.counter_form"))
@@ -109,15 +110,15 @@ def create_offline_order():
     total_cents = subtotal_cents - discount_cents
 
     order = Order(
-        customer_name=customer_name,
-        customer_phone=customer_phone,
+        customer_name=form["customer_name"],
+        customer_phone=form["customer_phone"],
         mode="offline",
         status="completed",
         subtotal_cents=subtotal_cents,
         discount_cents=discount_cents,
         total_cents=total_cents,
         coupon_code=None,
-        payment_mode=payment_mode,
+        payment_mode=form["payment_mode"],
         created_at=datetime.utcnow(),
     )
 
@@ -130,21 +131,24 @@ def create_offline_order():
                 quantity=qty,
                 unit_price_cents=unit,
                 line_total_cents=line_total,
+                item_name=mi.name,
+                item_category=mi.category,
             )
         )
 
     db.session.add(order)
     db.session.flush()
 
-    inv_rows = InventoryItem.query.filter(InventoryItem.menu_item_id.in_(ids)).all()
-    inv_by_menu_id = {r.menu_item_id: r for r in inv_rows}
-
-    for mi, qty in cart_items:
-        inv = inv_by_menu_id.get(mi.id)
-        if inv is not None:
-            inv.stock = max(0, int(inv.stock) - int(qty))
+    deplete_inventory((mi.id, qty) for mi, qty in cart_items)
 
     db.session.commit()
+    record_order_created(order.mode)
+    logger.log_order(
+        order.id,
+        "created",
+        user_id=session.get("user_id"),
+        details={"mode": order.mode, "total_cents": total_cents, "lines": len(cart_items)},
+    )
 
     flash(f"Offline order created: #{order.id}", "success")
     return redirect(url_for("orders.success", order_id=order.id))
@@ -153,15 +157,21 @@ def create_offline_order():
 @bp.get("/invoices/<int:order_id>.pdf")
 @login_required(role="staff")
 def invoice_pdf(order_id: int):
-    order = Order.query.get(order_id)
+    order = load_order(order_id, "order_detail")
     if order is None:
         flash("Order not found.", "danger")
         return redirect(url_for("staff.orders"))
 
+    render_start = time.perf_counter()
     html = render_template("staff/invoice.html", order=order)
 
+    # xhtml2pdf pulls in reportlab and friends (~0.8s); only pay for it on
+    # the first invoice rather than at every worker boot.
+    from xhtml2pdf import pisa
+
     pdf_io = BytesIO()
     result = pisa.CreatePDF(html, dest=pdf_io, encoding="utf-8")
+    INVOICE_RENDER.observe(time.perf_counter() - render_start)
     if result.err:
         flash("Failed to generate PDF.", "danger")
         return redirect(url_for("staff.orders"))
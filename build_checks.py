@@ -42,7 +42,8 @@ def run_build_checks(verbose: bool = False):
     all_passed = True
     
     with app.app_context():
-        health_status = get_overall_health()
+        # One-shot process: wait for the first SMTP login rather than report it pending.
+        health_status = get_overall_health(wait_for_first=True)
         
         # Print results
         for check in health_status["checks"]:
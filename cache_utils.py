@@ -0,0 +1,220 @@
+"""Per-worker caches for small, read-mostly tables.
+
+Cached values are plain tuples/namedtuples rather than ORM instances so they
+can be shared across requests and sessions safely. Each cache is rebuilt on
+first use after ``invalidate()`` or once ``CACHE_TTL`` seconds have passed.
+``version`` only moves when a reload returns different data, so it can key
+things derived from the cache (rendered template fragments).
+
+Invalidation reaches every worker through the ``cache_versions`` table:
+``invalidate()`` bumps the named counter, and the first cache read in each
+request compares all counters with the ones this worker last saw and drops
+the caches that moved. That costs one small query per request that touches
+a cache; TTL expiry only backs up writes made outside the app.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app, g
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+
+from extensions import db
+from metrics import CACHE_LOOKUPS
+from models import CacheVersion, Coupon, InventoryItem, MenuItem, RecipeComponent
+
+MenuItemRow = namedtuple(
+    "MenuItemRow",
+    "id name category price_cents is_available_online is_available_offline tags",
+)
+CouponRow = namedtuple(
+    "CouponRow", "id code discount_percent min_order_cents max_discount_cents"
+)
+
+
+class LocalCache:
+    def __init__(self, name: str, loader):
+        self.name = name
+        self.loader = loader
+        # (value, loaded_at, version) or None; replaced as one object so
+        # readers never see a fresh timestamp with a cleared value, or a
+        # value with another load's version.
+        self._entry = None
+        self._last_value = None  # previous load, for ``version``
+        self.version = 0
+        self.seen_version = None  # cache_versions value this copy reflects
+        self._lock = threading.Lock()
+        self._hits = CACHE_LOOKUPS.labels(name, "hit")
+        self._misses = CACHE_LOOKUPS.labels(name, "miss")
+
+    def get(self):
+        return self._get_entry()[0]
+
+    def get_versioned(self) -> tuple:
+        """``(version, value)`` from the same load."""
+        value, _, version = self._get_entry()
+        return version, value
+
+    def _get_entry(self):
+        _sync_versions()
+        entry = self._entry
+        if self._is_fresh(entry):
+            self._hits.inc()
+            return entry
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock.
+            entry = self._entry
+            if self._is_fresh(entry):
+                self._hits.inc()
+                return entry
+            self._misses.inc()
+            value = self.loader()
+            if value != self._last_value:
+                self.version += 1
+            self._last_value = value
+            self._entry = entry = (value, time.monotonic(), self.version)
+            return entry
+
+    @staticmethod
+    def _is_fresh(entry) -> bool:
+        return entry is not None and time.monotonic() - entry[1] < current_app.config["CACHE_TTL"]
+
+    def invalidate(self) -> None:
+        # Under the lock, so a load already in flight cannot overwrite this.
+        with self._lock:
+            self._entry = None
+
+
+def _load_menu():
+    rows = db.session.execute(
+        db.select(
+            MenuItem.id,
+            MenuItem.name,
+            MenuItem.category,
+            MenuItem.price_cents,
+            MenuItem.is_available_online,
+            MenuItem.is_available_offline,
+            MenuItem.tags,
+        ).order_by(MenuItem.category.asc(), MenuItem.name.asc())
+    ).all()
+    return tuple(MenuItemRow(*r) for r in rows)
+
+
+def _load_coupons():
+    rows = db.session.execute(
+        db.select(
+            Coupon.id,
+            Coupon.code,
+            Coupon.discount_percent,
+            Coupon.min_order_cents,
+            Coupon.max_discount_cents,
+        ).where(Coupon.is_active.is_(True))
+    ).all()
+    return {r.code: CouponRow(*r) for r in rows}
+
+
+def _load_recipes():
+    """The sparse recipe matrix: menu_item_id -> ((inventory_item_id, quantity), ...)."""
+    rows = {}
+    for menu_item_id, inventory_item_id, quantity in db.session.execute(
+        db.select(RecipeComponent.menu_item_id, RecipeComponent.inventory_item_id, RecipeComponent.quantity)
+    ):
+        rows.setdefault(menu_item_id, []).append((inventory_item_id, quantity))
+    matrix = {k: tuple(v) for k, v in rows.items()}
+
+    # Items without a recipe use one unit of their directly linked stock.
+    for inventory_item_id, menu_item_id in db.session.execute(
+        db.select(InventoryItem.id, InventoryItem.menu_item_id).where(InventoryItem.menu_item_id.is_not(None))
+    ):
+        if menu_item_id not in rows:
+            matrix[menu_item_id] = ((inventory_item_id, 1),)
+    return matrix
+
+
+CACHES = {
+    "menu": LocalCache("menu", _load_menu),
+    "coupons": LocalCache("coupons", _load_coupons),
+    "recipes": LocalCache("recipes", _load_recipes),
+}
+
+
+def _read_versions() -> dict:
+    # Its own connection: a failed read must not roll back the request's session.
+    try:
+        with db.engine.connect() as conn:
+            return dict(conn.execute(db.select(CacheVersion.name, CacheVersion.version)).all())
+    except (OperationalError, ProgrammingError):
+        # Table not created yet (run `flask upgrade-db`); fall back to TTL.
+        return {}
+
+
+def _sync_versions() -> None:
+    """Drop local caches whose shared version moved; once per request."""
+    if g.get("_cache_versions_synced"):
+        return
+    g._cache_versions_synced = True
+
+    versions = _read_versions()
+    for name, cache in CACHES.items():
+        version = versions.get(name, 0)
+        if cache.seen_version != version:
+            # Record the version before reloading: a bump that lands during
+            # the reload is then picked up by the next request.
+            cache.invalidate()
+            cache.seen_version = version
+
+
+def bump_version(name: str) -> None:
+    """Bump ``name`` in the current transaction; commits with the caller's write."""
+    updated = db.session.execute(
+        db.update(CacheVersion)
+        .where(CacheVersion.name == name)
+        .values(version=CacheVersion.version + 1)
+    ).rowcount
+    if updated:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(CacheVersion(name=name, version=1))
+    except IntegrityError:
+        # Another worker created the row first.
+        bump_version(name)
+
+
+def get_menu_items() -> tuple:
+    """All menu items ordered by category then name."""
+    return CACHES["menu"].get()
+
+
+def get_menu_snapshot() -> tuple:
+    """``(menu_version, items)`` read together, for keys derived from the items."""
+    return CACHES["menu"].get_versioned()
+
+
+def menu_version() -> int:
+    return CACHES["menu"].get_versioned()[0]
+
+
+def get_recipe_matrix() -> dict:
+    return CACHES["recipes"].get()
+
+
+def get_active_coupon(code: str):
+    return CACHES["coupons"].get().get(code)
+
+
+def invalidate(name: str) -> None:
+    """Drop ``name`` in every worker, for writes made outside a transaction."""
+    CACHES[name].invalidate()
+    bump_version(name)
+    db.session.commit()
+
+
+def warm_caches() -> None:
+    g.pop("_cache_versions_synced", None)
+    for cache in CACHES.values():
+        cache.seen_version = None  # forces a reload on the next sync
+    for cache in CACHES.values():
+        cache.get()
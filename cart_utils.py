@@ -11,7 +11,11 @@ def get_cart() -> dict[str, int]:
             normalized[str(int(k))] = int(v)
         except Exception:
             continue
-    session["cart"] = normalized
+    # Only write back when normalisation changed something: assigning marks
+    # the session modified and re-signs the cookie on every page that shows
+    # the cart count.
+    if normalized != cart:
+        session["cart"] = normalized
     return normalized
 
 
@@ -27,20 +31,3 @@ def cart_count() -> int:
     cart = get_cart()
     return sum(int(qty) for qty in cart.values())
 
-
-def parse_items_spec(spec: str) -> list[tuple[int, int]]:
-    if not spec:
-        return []
-
-    parts = [p.strip() for p in spec.split(";") if p.strip()]
-    items: list[tuple[int, int]] = []
-    for p in parts:
-        if ":" not in p:
-            raise ValueError("Invalid format. Use item_id:qty;item_id:qty")
-        item_id_s, qty_s = [x.strip() for x in p.split(":", 1)]
-        item_id = int(item_id_s)
-        qty = int(qty_s)
-        if qty <= 0:
-            raise ValueError("Quantity must be >= 1")
-        items.append((item_id, qty))
-    return items
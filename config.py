@@ -18,4 +18,66 @@ class Config:
     MAIL_SERVER = os.environ.get('MAIL_SERVER')
     MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() in ['true', 'on', '1']
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
-    MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
\ No newline at end of file
+    MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    # Login throttling and password-hash admission control
+    AUTH_RATE_LIMIT_ENABLED = os.environ.get('AUTH_RATE_LIMIT_ENABLED', 'true').lower() in ['true', 'on', '1']
+    AUTH_IP_BURST = int(os.environ.get('AUTH_IP_BURST', '20'))
+    AUTH_IP_PER_MINUTE = float(os.environ.get('AUTH_IP_PER_MINUTE', '30'))
+    # Per email from one IP; the looser ACCOUNT budget caps an email across all IPs
+    AUTH_EMAIL_BURST = int(os.environ.get('AUTH_EMAIL_BURST', '5'))
+    AUTH_EMAIL_PER_MINUTE = float(os.environ.get('AUTH_EMAIL_PER_MINUTE', '5'))
+    AUTH_ACCOUNT_BURST = int(os.environ.get('AUTH_ACCOUNT_BURST', '50'))
+    AUTH_ACCOUNT_PER_MINUTE = float(os.environ.get('AUTH_ACCOUNT_PER_MINUTE', '30'))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '1'))
+    PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', '4'))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', '5'))
+    # Database engine profile: auto, default, sqlite or postgres
+    DB_ENGINE_PROFILE = os.environ.get('DB_ENGINE_PROFILE', 'auto')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', '-65536'))  # negative = KiB
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '10'))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '20'))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', '10'))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '1800'))
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '5000'))
+    DB_LOCK_TIMEOUT_MS = int(os.environ.get('DB_LOCK_TIMEOUT_MS', '3000'))
+    DB_IDLE_TX_TIMEOUT_MS = int(os.environ.get('DB_IDLE_TX_TIMEOUT_MS', '60000'))
+    # Postgres only: deplete stock with one UPDATE ... FROM unnest() (recipes.py)
+    DB_DEPLETE_WITH_ARRAYS = os.environ.get('DB_DEPLETE_WITH_ARRAYS', 'false').lower() in ['true', 'on', '1']
+    # Per-request SQL instrumentation (opt-in)
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', 'false').lower() in ['true', 'on', '1']
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '100'))
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', '3'))
+    # Per-worker cache lifetime (seconds) for menu and coupon lookups
+    CACHE_TTL = float(os.environ.get('CACHE_TTL', '30'))
+    # Health probes
+    HEALTH_CHECK_TIMEOUT = float(os.environ.get('HEALTH_CHECK_TIMEOUT', '2'))
+    EMAIL_HEALTH_REFRESH_SECONDS = float(os.environ.get('EMAIL_HEALTH_REFRESH_SECONDS', '300'))
+    # Prometheus /metrics endpoint and request metrics
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ['true', 'on', '1']
+    # Structured event log (utils.StructuredLogger)
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+    LOG_SAMPLE_RATES = os.environ.get('LOG_SAMPLE_RATES', '')  # e.g. "auth.login=0.1,order.created=1"
+    # Opt-in request profiling (profiling.py)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() in ['true', 'on', '1']
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+    PROFILE_DIR = os.environ.get('PROFILE_DIR')  # defaults to <instance>/profiles
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', '200'))
+    PROFILE_TOKEN_MAX_AGE = int(os.environ.get('PROFILE_TOKEN_MAX_AGE', '3600'))
+    # Jinja bytecode cache and rendered-fragment cache (template_cache.py)
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR')  # defaults to Jinja's per-user <tmp>/_jinja2-cache-<uid>
+    FRAGMENT_CACHE_ENABLED = os.environ.get('FRAGMENT_CACHE_ENABLED', 'true').lower() in ['true', 'on', '1']
+    FRAGMENT_CACHE_SIZE = int(os.environ.get('FRAGMENT_CACHE_SIZE', '512'))
+    # gzip/brotli response compression middleware (compression.py)
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() in ['true', 'on', '1']
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', '5'))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '4'))
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1400'))
+    # Anonymous full-page micro-cache (page_cache.py); 0 disables
+    PAGE_CACHE_TTL = float(os.environ.get('PAGE_CACHE_TTL', '2'))
+    PAGE_CACHE_MAX_ENTRIES = int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', '256'))
+    PAGE_CACHE_WAIT = float(os.environ.get('PAGE_CACHE_WAIT', '2'))
+    PAGE_CACHE_SHARED_PATH = os.environ.get('PAGE_CACHE_SHARED_PATH')  # SQLite file shared by workers
+    # Take a menu item off sale when its inventory drops to the reorder threshold (stock_watch.py)
+    LOW_STOCK_DISABLES_MENU = os.environ.get('LOW_STOCK_DISABLES_MENU', 'false').lower() in ['true', 'on', '1']
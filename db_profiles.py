@@ -0,0 +1,109 @@
+"""Named SQLAlchemy engine profiles.
+
+A profile bundles engine options (pooling, timeouts) and, for SQLite, the
+pragmas applied to every new connection. ``Config.DB_ENGINE_PROFILE`` picks
+one by name; ``auto`` chooses from the database URL's dialect.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+def _sqlite_profile(config: dict) -> dict:
+    return {
+        "engine_options": {
+            # pysqlite's own lock wait; busy_timeout below covers the C side.
+            "connect_args": {"timeout": config["SQLITE_BUSY_TIMEOUT_MS"] / 1000.0},
+        },
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": config["SQLITE_BUSY_TIMEOUT_MS"],
+            "mmap_size": config["SQLITE_MMAP_SIZE"],
+            "cache_size": config["SQLITE_CACHE_SIZE"],
+            "temp_store": "MEMORY",
+        },
+    }
+
+
+def _postgres_profile(config: dict) -> dict:
+    timeouts = (
+        f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']} "
+        f"-c lock_timeout={config['DB_LOCK_TIMEOUT_MS']} "
+        f"-c idle_in_transaction_session_timeout={config['DB_IDLE_TX_TIMEOUT_MS']}"
+    )
+    return {
+        "engine_options": {
+            "pool_size": config["DB_POOL_SIZE"],
+            "max_overflow": config["DB_MAX_OVERFLOW"],
+            "pool_timeout": config["DB_POOL_TIMEOUT"],
+            "pool_recycle": config["DB_POOL_RECYCLE"],
+            "pool_pre_ping": True,
+            "connect_args": {"options": timeouts},
+        },
+        "pragmas": {},
+    }
+
+
+def _default_profile(config: dict) -> dict:
+    return {"engine_options": {}, "pragmas": {}}
+
+
+ENGINE_PROFILES = {
+    "default": _default_profile,
+    "sqlite": _sqlite_profile,
+    "postgres": _postgres_profile,
+}
+
+
+def resolve_profile_name(name: str, database_uri: str) -> str:
+    name = (name or "auto").lower()
+    if name != "auto":
+        if name not in ENGINE_PROFILES:
+            raise ValueError(f"Unknown DB_ENGINE_PROFILE: {name}")
+        return name
+
+    backend = make_url(database_uri).get_backend_name()
+    if backend == "sqlite":
+        return "sqlite"
+    if backend == "postgresql":
+        return "postgres"
+    return "default"
+
+
+def get_profile(name: str, database_uri: str, config: dict) -> dict:
+    return ENGINE_PROFILES[resolve_profile_name(name, database_uri)](config)
+
+
+def install_sqlite_pragmas(engine, pragmas: dict) -> None:
+    """Run ``PRAGMA key=value`` for each pragma on every new DBAPI connection."""
+    if not pragmas:
+        return
+
+    statements = [f"PRAGMA {key}={value}" for key, value in pragmas.items()]
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for stmt in statements:
+                cursor.execute(stmt)
+        finally:
+            cursor.close()
+
+
+def configure_engine_profile(app) -> dict:
+    """Merge the selected profile into ``SQLALCHEMY_ENGINE_OPTIONS``.
+
+    Must run before ``db.init_app``. Returns the profile so the caller can
+    install its pragmas once the engine exists.
+    """
+    profile = get_profile(
+        app.config["DB_ENGINE_PROFILE"],
+        app.config["SQLALCHEMY_DATABASE_URI"],
+        app.config,
+    )
+    options = dict(profile["engine_options"])
+    options.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+    return profile
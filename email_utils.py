@@ -1,14 +1,15 @@
 import os
+import time
 from textwrap import dedent
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 from flask import current_app
 
+from metrics import EMAIL_OUTBOX, EMAIL_SEND_LATENCY
+
 def _send_email(recipient: str, subject: str, html_body: str, text_body: str = None):
     """Send a multipart HTML email via Gmail SMTP using app password.
     
-    Requires env vars: GMAIL_EMAIL, GMAIL_APP_PASSWORD.
+    Requires env vars: GMAIL_EMAIL, GMAIL_APP_PASSWORD. SMTP_HOST, SMTP_PORT
+    and SMTP_USE_SSL point it elsewhere (e.g. a local stub for benchmarks).
     """
     sender = os.getenv("GMAIL_EMAIL")
     password = os.getenv("GMAIL_APP_PASSWORD")
@@ -17,6 +18,11 @@ def _send_email(recipient: str, subject: str, html_body: str, text_body: str = N
         current_app.logger.error("Gmail credentials not configured in env.")
         return
     
+    # Deferred so app start-up does not pay for smtplib/ssl/email.mime.
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
     # Create multipart message
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
@@ -32,13 +38,25 @@ def _send_email(recipient: str, subject: str, html_body: str, text_body: str = N
         text_part = MIMEText(text_body, "plain")
         msg.attach(text_part)
     
+    host = os.getenv("SMTP_HOST", "smtp.gmail.com")
+    port = int(os.getenv("SMTP_PORT", "465"))
+    use_ssl = os.getenv("SMTP_USE_SSL", "true").lower() in ["true", "on", "1"]
+    smtp_class = smtplib.SMTP_SSL if use_ssl else smtplib.SMTP
+
+    EMAIL_OUTBOX.inc()
+    start = time.perf_counter()
+    result = "error"
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
+        with smtp_class(host, port) as smtp:
             smtp.login(sender, password)
             smtp.send_message(msg)
+        result = "sent"
         current_app.logger.info(f"Sent HTML email to {recipient}: {subject}")
     except Exception as e:
         current_app.logger.error(f"Failed to send email to {recipient}: {e}")
+    finally:
+        EMAIL_OUTBOX.dec()
+        EMAIL_SEND_LATENCY.labels(result).observe(time.perf_counter() - start)
 
 def send_order_confirmation_email(order):
     """Send beautifully formatted HTML order confirmation email."""
@@ -55,7 +73,7 @@ Total: ₹{order.total_cents / 100:.2f}
 Items:
 """)
     for item in order.items:
-        text_body += f"- {item.quantity} × {item.menu_item.name} = ₹{item.line_total_cents / 100:.2f}\n"
+        text_body += f"- {item.quantity} × {item.display_name} = ₹{item.line_total_cents / 100:.2f}\n"
     
     text_body += dedent("""We'll notify you when your order is ready.
 
@@ -77,7 +95,7 @@ Café Fusion Team""")
     items_html = ""
     for item in order.items:
         items_html += dedent(f"""    <tr>
-        <td style="padding: 8px 12px; border-bottom: 1px solid #eee; text-align: left;">{item.menu_item.name}</td>
+        <td style="padding: 8px 12px; border-bottom: 1px solid #eee; text-align: left;">{item.display_name}</td>
         <td style="padding: 8px 12px; border-bottom: 1px solid #eee; text-align: center;">{item.quantity}</td>
         <td style="padding: 8px 12px; border-bottom: 1px solid #eee; text-align: right;">₹{item.line_total_cents / 100:.2f}</td>
     </tr>""")
@@ -0,0 +1,105 @@
+"""Gunicorn settings for Cafe Fusion.
+
+Picked up automatically by ``gunicorn`` when run from the repo root. Every
+setting can be overridden with the ``GUNICORN_*`` environment variable shown
+next to it.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.environ.get(name, default).lower() in ["true", "on", "1"]
+
+
+# prometheus_client picks its multiprocess (mmap file) mode from this variable
+# at import time, so it must be set here, before the app is preloaded. Unless
+# the operator chose a directory, use a private one of our own; the env marker
+# survives HUP reloads, which re-read this file.
+_OWNED_METRICS_ENV = "CAFE_FUSION_OWNED_METRICS_DIR"
+if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = os.environ[_OWNED_METRICS_ENV] = tempfile.mkdtemp(
+        prefix="cafe_fusion_metrics_"
+    )
+
+
+def _owned_metrics_dir():
+    path = os.environ.get(_OWNED_METRICS_ENV)
+    return path if path and path == os.environ.get("PROMETHEUS_MULTIPROC_DIR") else None
+
+wsgi_app = os.environ.get("GUNICORN_APP", "app:app")
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Requests spend most of their time waiting on SQLite/Postgres and SMTP, so
+# threads per worker soak up that I/O wait; processes cover the CPU-bound
+# parts (templates, PDFs, password hashing).
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+
+# Import the app once in the master so workers share its pages copy-on-write
+# and boot in milliseconds.
+preload_app = _env_bool("GUNICORN_PRELOAD", "true")
+
+# Recycle workers periodically (bounded memory growth from xhtml2pdf/reportlab);
+# jitter keeps them from all restarting at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-") or None
+loglevel = os.environ.get("GUNICORN_LOGLEVEL", "info")
+
+
+def on_starting(server):
+    """Start counters from zero, but only in a metrics directory we created."""
+    path = _owned_metrics_dir()
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, mode=0o700, exist_ok=True)
+
+
+def on_exit(server):
+    path = _owned_metrics_dir()
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def when_ready(server):
+    """Compile every template in the master so forked workers inherit them."""
+    if not preload_app:
+        return
+    from template_cache import precompile_templates
+
+    count = precompile_templates(server.app.wsgi())
+    server.log.info(f"Precompiled {count} templates")
+
+
+def post_fork(server, worker):
+    """Give each worker its own DB connections and warm caches before serving."""
+    from cache_utils import warm_caches
+    from extensions import db
+
+    flask_app = server.app.wsgi()
+    with flask_app.app_context():
+        # Connections opened in the master (preload) must not be shared with
+        # children; close=False leaves the parent's sockets alone.
+        db.engine.dispose(close=False)
+        try:
+            warm_caches()
+        except Exception as e:
+            # Tables may not exist yet on a fresh deploy; caches fill lazily.
+            worker.log.warning(f"Cache warm-up failed: {e}")
+
+
+def child_exit(server, worker):
+    """Fold a dead worker's live gauges out of the shared metrics files."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
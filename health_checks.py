@@ -1,8 +1,11 @@
 import os
-import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 from flask import current_app
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 from extensions import db
 
 
@@ -16,83 +19,158 @@ class HealthCheckResult:
 
 
 def check_database():
-    """Check database connection and basic operations."""
+    """Check the connection and that every model table exists.
+
+    Table existence comes from the catalog (sqlite_master/pg_catalog), so the
+    probe costs the same on an empty database and after a year of orders.
+    """
     try:
-        # Test basic connection
         result = db.session.execute(text("SELECT 1"))
         if result.fetchone()[0] != 1:
             return HealthCheckResult("database", False, "Database query failed")
-        
-        # Test table existence - using the correct table name 'user' instead of 'users'
-        try:
-            db.session.execute(text("SELECT COUNT(*) FROM user"))
-            db.session.execute(text("SELECT COUNT(*) FROM menu_item"))
-            db.session.execute(text("SELECT COUNT(*) FROM \"order\""))
-            db.session.execute(text("SELECT COUNT(*) FROM order_item"))
-            db.session.execute(text("SELECT COUNT(*) FROM inventory_item"))
-            db.session.execute(text("SELECT COUNT(*) FROM coupon"))
-        except Exception as e:
+
+        existing = set(inspect(db.engine).get_table_names())
+        missing = sorted(set(db.metadata.tables) - existing)
+        if missing:
             return HealthCheckResult(
-                "database", 
-                False, 
-                f"Database tables not properly initialized: {str(e)}"
+                "database",
+                False,
+                f"Database tables not properly initialized: missing {', '.join(missing)}",
+                {"missing_tables": missing}
             )
-        
+
         return HealthCheckResult(
-            "database", 
-            True, 
+            "database",
+            True,
             "Database connection successful",
             {"tables_exist": True}
         )
     except Exception as e:
         return HealthCheckResult(
-            "database", 
-            False, 
+            "database",
+            False,
             f"Database connection failed: {str(e)}"
         )
 
-def check_email_service():
-    """Check email service configuration and connectivity."""
+
+# Socket timeout for each step of the SMTP probe (connect, STARTTLS, login).
+SMTP_PROBE_TIMEOUT = 10
+
+
+def _probe_smtp(mail_username, mail_password):
+    """Log in to Gmail over STARTTLS. Slow (network round trips); never call per probe."""
+    if not all([mail_username, mail_password]):
+        return HealthCheckResult(
+            "email",
+            False,
+            "Email service not fully configured",
+            {
+                "username": bool(mail_username),
+                "password": bool(mail_password)
+            }
+        )
+
+    import smtplib
+
     try:
-        mail_username = current_app.config.get('GMAIL_EMAIL')
-        mail_password = current_app.config.get('GMAIL_APP_PASSWORD')
+        server = smtplib.SMTP("smtp.gmail.com", 587, timeout=SMTP_PROBE_TIMEOUT)
+        server.starttls()
 
-        # Check required configuration
-        if not all([mail_username, mail_password]):
-            return HealthCheckResult(
-                "email", 
-                False, 
-                "Email service not fully configured",
-                {
-                    "username": bool(mail_username),
-                    "password": bool(mail_password)
-                }
-            )
-        
-        # Test SMTP connection
-        try:
-            server = smtplib.SMTP("smtp.gmail.com", 587)
-            server.starttls()
-            
-            server.login(mail_username, mail_password)
-            server.quit()
-            
-            return HealthCheckResult(
-                "email", 
-                True, 
-                "Email service connection successful",
-                {
-                    "server": "smtp.gmail.com",
-                    "port": 587,
-                }
+        server.login(mail_username, mail_password)
+        server.quit()
+
+        return HealthCheckResult(
+            "email",
+            True,
+            "Email service connection successful",
+            {
+                "server": "smtp.gmail.com",
+                "port": 587,
+            }
+        )
+    except smtplib.SMTPAuthenticationError:
+        return HealthCheckResult("email", False, "Email authentication failed")
+    except smtplib.SMTPConnectError:
+        return HealthCheckResult("email", False, "Cannot connect to email server")
+    except Exception as e:
+        return HealthCheckResult("email", False, f"Email service error: {str(e)}")
+
+
+class _EmailStatusRefresher:
+    """Background thread that re-probes SMTP every ``interval`` seconds.
+
+    Health checks read the last result instead of opening an SMTP session
+    themselves. One thread per process; restarted after fork.
+    """
+
+    def __init__(self):
+        self._result = None
+        self._first_result = threading.Event()
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self, mail_username, mail_password, interval):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._result = None
+            self._first_result = threading.Event()
+            thread = threading.Thread(
+                target=self._run,
+                args=(mail_username, mail_password, interval),
+                name="smtp-health",
+                daemon=True,
             )
-        except smtplib.SMTPAuthenticationError:
-            return HealthCheckResult("email", False, "Email authentication failed")
-        except smtplib.SMTPConnectError:
-            return HealthCheckResult("email", False, "Cannot connect to email server")
-        except Exception as e:
-            return HealthCheckResult("email", False, f"Email service error: {str(e)}")
-            
+            thread.start()
+
+    def _run(self, mail_username, mail_password, interval):
+        while True:
+            self._result = _probe_smtp(mail_username, mail_password)
+            self._first_result.set()
+            time.sleep(interval)
+
+    def get(self, wait):
+        self._first_result.wait(wait)
+        return self._result
+
+
+_email_status = _EmailStatusRefresher()
+
+
+def _start_email_status():
+    cfg = current_app.config
+    _email_status.ensure_started(
+        cfg.get('GMAIL_EMAIL'),
+        cfg.get('GMAIL_APP_PASSWORD'),
+        cfg['EMAIL_HEALTH_REFRESH_SECONDS'],
+    )
+
+
+def wait_for_email_status():
+    """Block until the first SMTP probe has finished (one-shot callers like build_checks)."""
+    _start_email_status()
+    return _email_status.get(wait=3 * SMTP_PROBE_TIMEOUT)
+
+
+def check_email_service():
+    """Report the cached result of the background SMTP probe."""
+    try:
+        _start_email_status()
+        # Leave headroom inside the caller's overall timeout on the first probe.
+        result = _email_status.get(wait=current_app.config['HEALTH_CHECK_TIMEOUT'] / 2)
+        if result is None:
+            return HealthCheckResult("email", False, "Email check pending")
+
+        age = (datetime.utcnow() - result.timestamp).total_seconds()
+        return HealthCheckResult(
+            "email",
+            result.status,
+            result.message,
+            dict(result.details, checked_seconds_ago=round(age, 1))
+        )
     except Exception as e:
         return HealthCheckResult("email", False, f"Email check failed: {str(e)}")
 
@@ -177,35 +255,122 @@ def check_required_config():
         return HealthCheckResult("configuration", False, f"Configuration check failed: {str(e)}")
 
 
-def run_all_health_checks():
-    """Run all health checks and return results."""
-    checks = [
-        check_database,
-        check_email_service,
-        check_file_system,
-        check_required_config
-    ]
-    
-    results = []
+ALL_CHECKS = [
+    check_database,
+    check_email_service,
+    check_file_system,
+    check_required_config
+]
+
+# Checks that gate /readyz. Email is reported but not required: the shop can
+# take orders while Gmail is unreachable.
+READINESS_CHECKS = [check_database, check_email_service]
+CRITICAL_SERVICES = {"database"}
+
+# Service each check reports as, for results the check could not produce itself.
+SERVICE_NAMES = {
+    check_database: "database",
+    check_email_service: "email",
+    check_file_system: "file_system",
+    check_required_config: "configuration",
+}
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+# Checks that overran their deadline and are still running, by check function.
+_overrunning = {}
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    if _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="health")
+                _executor_pid = os.getpid()
+                _overrunning.clear()
+    return _executor
+
+
+def _recycle_executor(stuck) -> None:
+    """Hand the pool's threads over to the stuck checks and start a fresh pool."""
+    global _executor
+    with _executor_lock:
+        if _executor is stuck:
+            stuck.shutdown(wait=False, cancel_futures=True)
+            _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="health")
+
+
+def _run_in_app_context(app, check_func):
+    with app.app_context():
+        return check_func()
+
+
+def run_all_health_checks(checks=None):
+    """Run checks concurrently, each bounded by HEALTH_CHECK_TIMEOUT seconds."""
+    checks = checks or ALL_CHECKS
+    app = current_app._get_current_object()
+    timeout = app.config['HEALTH_CHECK_TIMEOUT']
+
+    executor = _get_executor()
+    futures = []
     for check_func in checks:
+        previous = _overrunning.get(check_func)
+        if previous is not None and not previous.done():
+            # At most one hung run per check, however often we are probed.
+            futures.append((check_func, None))
+            continue
+        _overrunning.pop(check_func, None)
+        futures.append((check_func, executor.submit(_run_in_app_context, app, check_func)))
+    deadline = time.monotonic() + timeout
+
+    results = []
+    timed_out = False
+    for check_func, future in futures:
+        service = SERVICE_NAMES.get(check_func, check_func.__name__)
+        if future is None:
+            results.append(HealthCheckResult(
+                service,
+                False,
+                "Previous health check is still running"
+            ))
+            continue
         try:
-            result = check_func()
-            results.append(result)
+            results.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+        except FutureTimeoutError:
+            _overrunning[check_func] = future
+            timed_out = True
+            results.append(HealthCheckResult(
+                service,
+                False,
+                f"Health check timed out after {timeout}s"
+            ))
         except Exception as e:
             results.append(HealthCheckResult(
-                check_func.__name__,
+                service,
                 False,
                 f"Health check failed to run: {str(e)}"
             ))
-    
+
+    if timed_out:
+        _recycle_executor(executor)
     return results
 
 
-def get_overall_health():
-    """Get overall health status."""
-    results = run_all_health_checks()
+def get_overall_health(checks=None, critical_only=False, wait_for_first=False):
+    """Get overall health status.
+
+    ``wait_for_first`` waits for a real first SMTP result rather than
+    reporting it pending; /readyz keeps the short wait.
+    """
+    if wait_for_first:
+        wait_for_email_status()
+    results = run_all_health_checks(checks)
     
     failed_checks = [r for r in results if not r.status]
+    if critical_only:
+        failed_checks = [r for r in failed_checks if r.service_name in CRITICAL_SERVICES]
     overall_status = len(failed_checks) == 0
     
     return {
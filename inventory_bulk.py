@@ -0,0 +1,98 @@
+"""Bulk stock updates for ``flask import-stock`` and the inventory page.
+
+A stock-take is a list of ``item_id,quantity`` lines. In ``set`` mode the
+quantity replaces the stock; in ``adjust`` mode it is added to it (negative
+for wastage), never going below zero. All known ids are written with one
+executemany UPDATE in a single transaction; unknown ids are returned so the
+caller can report them. Low-stock flags are updated in the same statement
+(see stock_watch.py).
+"""
+
+import csv
+import io
+from datetime import datetime
+
+from sqlalchemy import bindparam, case, update
+
+from extensions import db
+from models import MAX_INTEGER, InventoryItem
+from recipes import menu_items_using
+from stock_watch import crossed_threshold, disable_menu_items, low_stock_expr
+
+MODES = ("set", "adjust")
+# Ids are 32-bit integer columns; quantities stay far enough below that
+# limit that stock plus an adjustment cannot overflow one either.
+MAX_ITEM_ID = MAX_INTEGER
+MAX_QUANTITY = 1_000_000
+
+
+def parse_stock_lines(text: str) -> list[tuple[int, int]]:
+    """``item_id,quantity`` rows; a header row and blank lines are skipped."""
+    changes = []
+    for line, row in enumerate(csv.reader(io.StringIO(text)), start=1):
+        cells = [c.strip() for c in row]
+        if not any(cells):
+            continue
+        if line == 1 and not cells[0].lstrip("-").isdigit():
+            continue
+        try:
+            item_id, quantity = int(cells[0]), int(cells[1])
+        except (IndexError, ValueError):
+            raise ValueError(f"Line {line}: expected item_id,quantity.") from None
+        if not 1 <= item_id <= MAX_ITEM_ID:
+            raise ValueError(f"Line {line}: item_id must be between 1 and {MAX_ITEM_ID}.")
+        if abs(quantity) > MAX_QUANTITY:
+            raise ValueError(f"Line {line}: quantity must be between -{MAX_QUANTITY} and {MAX_QUANTITY}.")
+        changes.append((item_id, quantity))
+    return changes
+
+
+def apply_stock_changes(changes, mode: str = "set") -> tuple[int, list[int]]:
+    """Apply ``(item_id, quantity)`` pairs; returns (rows updated, unknown ids)."""
+    if mode not in MODES:
+        raise ValueError("Invalid mode.")
+
+    merged = {}
+    for item_id, quantity in changes:
+        # Repeated ids: the last count wins, adjustments add up.
+        merged[item_id] = merged.get(item_id, 0) + quantity if mode == "adjust" else quantity
+        if abs(merged[item_id]) > MAX_QUANTITY:
+            raise ValueError(f"Item {item_id}: total quantity must be between -{MAX_QUANTITY} and {MAX_QUANTITY}.")
+    if not merged:
+        return 0, []
+
+    previously_low = set()
+    known = set()
+    for item_id, low in db.session.execute(
+        db.select(InventoryItem.id, InventoryItem.low_stock).where(InventoryItem.id.in_(merged))
+    ):
+        known.add(item_id)
+        if low:
+            previously_low.add(item_id)
+    unknown = sorted(set(merged) - known)
+
+    table = InventoryItem.__table__
+    now = datetime.utcnow()
+    if mode == "set":
+        stmt = update(table).where(table.c.id == bindparam("b_id")).values(
+            stock=bindparam("quantity"),
+            last_restock=now,
+            low_stock=low_stock_expr(bindparam("quantity")),
+        )
+        params = [{"b_id": i, "quantity": max(0, q)} for i, q in merged.items() if i in known]
+    else:
+        adjusted = table.c.stock + bindparam("quantity")
+        new_stock = case((adjusted < 0, 0), else_=adjusted)
+        stmt = update(table).where(table.c.id == bindparam("b_id")).values(
+            stock=new_stock,
+            low_stock=low_stock_expr(new_stock),
+            # Only deliveries count as a restock, not wastage.
+            last_restock=case((bindparam("quantity") > 0, now), else_=table.c.last_restock),
+        )
+        params = [{"b_id": i, "quantity": q} for i, q in merged.items() if i in known]
+
+    if params:
+        db.session.execute(stmt, params)
+        disable_menu_items(menu_items_using(crossed_threshold(known, previously_low)))
+    db.session.commit()
+    return len(params), unknown
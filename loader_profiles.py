@@ -0,0 +1,33 @@
+"""Named eager-loading profiles for views that render orders.
+
+``Order.items`` and ``OrderItem.menu_item`` are lazy, so walking an order's
+lines costs one query per line per relationship. Views ask for the profile
+matching what their template touches instead of relying on lazy loads.
+"""
+
+from sqlalchemy.orm import selectinload
+
+from extensions import db
+from models import Order
+
+LOADER_PROFILES = {
+    # Header fields only (id, status, totals).
+    "order_summary": (),
+    # Header plus every line: two queries in total. Lines carry their own
+    # name/category snapshot, so menu_item is not joined.
+    "order_detail": (selectinload(Order.items),),
+}
+
+
+def load_order(order_id: int, profile: str = "order_summary"):
+    """Fetch an order with the named profile's loader options applied.
+
+    ``populate_existing`` makes the options take effect even when the order
+    is already in the session, e.g. right after it was committed.
+    """
+    return db.session.get(
+        Order,
+        order_id,
+        options=LOADER_PROFILES[profile],
+        populate_existing=bool(LOADER_PROFILES[profile]),
+    )
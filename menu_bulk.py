@@ -0,0 +1,148 @@
+"""Bulk menu changes for ``flask import-menu`` and the staff bulk page.
+
+``upsert_menu_items`` matches rows to existing items by ``id`` or, without
+one, by ``(name, category)``, then writes all updates and all inserts as
+Core executemany batches. ``set_availability`` flips the online/offline
+flags of every item selected by ids, category and/or tag with one UPDATE.
+Either way the menu cache version is bumped once, in the same transaction.
+"""
+
+import csv
+import io
+import json
+from collections import defaultdict
+
+from sqlalchemy import bindparam, func, insert, literal, update
+
+from cache_utils import bump_version
+from extensions import db
+from models import MAX_INTEGER, MenuItem
+from utils import compile_form_schema
+
+MENU_ROW = compile_form_schema({
+    "id": {"type": "integer", "min": 1, "max": MAX_INTEGER, "label": "Id"},
+    "name": {"type": "string", "required": True, "max_length": 255},
+    "category": {"type": "string", "required": True, "max_length": 100},
+    "price_cents": {"type": "integer", "required": True, "min": 0, "max": MAX_INTEGER, "label": "Price"},
+    "is_available_online": {"type": "bool", "default": True},
+    "is_available_offline": {"type": "bool", "default": True},
+    "tags": {"type": "string"},
+})
+# Applied on update only when the source row has the column.
+OPTIONAL_COLUMNS = ("is_available_online", "is_available_offline", "tags")
+
+
+def normalize_tags(raw) -> str | None:
+    """``" Vegan, spicy ,,"`` -> ``"vegan,spicy"``; empty -> None."""
+    tags = dict.fromkeys(t.strip().lower() for t in (raw or "").split(","))
+    tags.pop("", None)
+    return ",".join(tags) or None
+
+
+def parse_menu_file(text: str, fmt: str) -> list[dict]:
+    """Rows of a CSV (with a header line) or JSON (list of objects) upload."""
+    if fmt == "json":
+        try:
+            rows = json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON: {e}") from None
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise ValueError("JSON must be a list of objects.")
+    elif fmt == "csv":
+        rows = list(csv.DictReader(io.StringIO(text)))
+    else:
+        raise ValueError("Upload a .csv or .json file.")
+
+    # Validators take form-style strings; JSON numbers and booleans too.
+    return [
+        {k.strip(): None if v is None else str(v) for k, v in row.items() if k}
+        for row in rows
+    ]
+
+
+def upsert_menu_items(rows: list[dict]) -> tuple[int, int]:
+    """Validate every row, then apply them all or none; returns (inserted, updated)."""
+    by_key = {}
+    known_ids = set()
+    for item_id, name, category in db.session.execute(
+        db.select(MenuItem.id, MenuItem.name, MenuItem.category)
+    ):
+        by_key[(name, category)] = item_id
+        known_ids.add(item_id)
+
+    inserts, updates = {}, {}
+    for line, raw in enumerate(rows, start=1):
+        try:
+            row = MENU_ROW(raw)
+        except ValueError as e:
+            raise ValueError(f"Row {line}: {e}") from None
+        row["tags"] = normalize_tags(row["tags"])
+
+        item_id = row.pop("id")
+        if item_id is None:
+            item_id = by_key.get((row["name"], row["category"]))
+        elif item_id not in known_ids:
+            raise ValueError(f"Row {line}: no menu item with id {item_id}.")
+
+        # A later row for the same item wins, new or existing.
+        if item_id is None:
+            inserts[(row["name"], row["category"])] = row
+        else:
+            updates[item_id] = {
+                k: v for k, v in row.items() if k not in OPTIONAL_COLUMNS or k in raw
+            }
+
+    # executemany needs the same columns in every row of a batch.
+    batches = defaultdict(list)
+    for item_id, values in updates.items():
+        batches[tuple(sorted(values))].append({"b_id": item_id, **values})
+    table = MenuItem.__table__
+    for columns, params in batches.items():
+        db.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values({c: bindparam(c) for c in columns}),
+            params,
+        )
+    if inserts:
+        db.session.execute(insert(table), list(inserts.values()))
+
+    if inserts or updates:
+        bump_version("menu")
+    db.session.commit()
+    return len(inserts), len(updates)
+
+
+def set_availability(ids=(), category: str = "", tag: str = "", online=None, offline=None) -> int:
+    """Set the given flags on items matching all selectors; returns the row count."""
+    values = {}
+    if online is not None:
+        values["is_available_online"] = online
+    if offline is not None:
+        values["is_available_offline"] = offline
+    if not values:
+        raise ValueError("Choose online and/or offline availability.")
+
+    conditions = []
+    if ids:
+        conditions.append(MenuItem.id.in_(ids))
+    if category:
+        conditions.append(func.lower(MenuItem.category) == category.strip().lower())
+    tag = normalize_tags(tag)
+    if tag:
+        if "," in tag:
+            raise ValueError("Select a single tag.")
+        # Tags are stored normalised, so ",a,b," contains ",<tag>,".
+        escaped = tag.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        padded = literal(",") + MenuItem.tags + literal(",")
+        conditions.append(padded.like(f"%,{escaped},%", escape="\\"))
+    if not conditions:
+        raise ValueError("Select items by id, category or tag.")
+
+    count = db.session.execute(
+        update(MenuItem).where(*conditions).values(values).execution_options(synchronize_session=False)
+    ).rowcount
+    if count:
+        bump_version("menu")
+    db.session.commit()
+    return count
@@ -0,0 +1,122 @@
+"""In-memory menu search.
+
+An inverted index over the cached menu: every word of an item's name, tags
+and category maps to the items containing it, weighted by field. The
+vocabulary is kept sorted so a query word matches all words it prefixes
+("choc" finds "chocolate") with a bisect. The index is rebuilt whenever
+``menu_version()`` moves, which menu writes in any worker trigger through
+the cache version bus, so it never needs its own invalidation.
+"""
+
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from cache_utils import get_menu_snapshot, menu_version
+
+_WORD_RE = re.compile(r"\w+")
+
+# Field weights; an exact word scores double a prefix match.
+NAME_WEIGHT = 4.0
+TAG_WEIGHT = 2.0
+CATEGORY_WEIGHT = 1.0
+# One-letter words only match exactly; as prefixes they match half the menu.
+MIN_PREFIX = 2
+# Per-index memo of term -> scores, for typeahead-style repeated prefixes.
+TERM_CACHE_SIZE = 1024
+
+
+def tokenize(text: str | None) -> list[str]:
+    return _WORD_RE.findall(text.lower()) if text else []
+
+
+class MenuSearchIndex:
+    def __init__(self, items):
+        self.items = items
+        postings = defaultdict(dict)
+        for pos, item in enumerate(items):
+            for words, weight in (
+                (tokenize(item.name), NAME_WEIGHT),
+                (tokenize(item.tags), TAG_WEIGHT),
+                (tokenize(item.category), CATEGORY_WEIGHT),
+            ):
+                for word in words:
+                    if postings[word].get(pos, 0) < weight:
+                        postings[word][pos] = weight
+        self._postings = dict(postings)
+        self._vocabulary = sorted(postings)
+        self._term_cache = {}
+
+    def _term_scores(self, term: str) -> dict:
+        scores = self._term_cache.get(term)
+        if scores is not None:
+            return scores
+        if len(term) < MIN_PREFIX:
+            scores = dict(self._postings.get(term, ()))
+        else:
+            scores = self._prefix_scores(term)
+        if len(self._term_cache) >= TERM_CACHE_SIZE:
+            self._term_cache.clear()
+        self._term_cache[term] = scores
+        return scores
+
+    def _prefix_scores(self, term: str) -> dict:
+        scores = {}
+        vocabulary = self._vocabulary
+        i = bisect_left(vocabulary, term)
+        while i < len(vocabulary) and vocabulary[i].startswith(term):
+            word = vocabulary[i]
+            factor = 1.0 if word == term else 0.5
+            for pos, weight in self._postings[word].items():
+                score = weight * factor
+                if scores.get(pos, 0) < score:
+                    scores[pos] = score
+            i += 1
+        return scores
+
+    def search(self, query: str, limit: int = 20, predicate=None) -> list:
+        """Items matching every query word (as a prefix), best first."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        totals = None
+        # Rarest-looking (longest) terms first keeps the candidate set small.
+        for term in sorted(set(terms), key=len, reverse=True):
+            scores = self._term_scores(term)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {pos: total + scores[pos] for pos, total in totals.items() if pos in scores}
+            if not totals:
+                return []
+
+        items = self.items
+        candidates = totals.items()
+        if predicate is not None:
+            candidates = [(pos, score) for pos, score in candidates if predicate(items[pos])]
+        best = heapq.nsmallest(limit, candidates, key=lambda kv: (-kv[1], items[kv[0]].name))
+        return [items[pos] for pos, _ in best]
+
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> MenuSearchIndex:
+    global _index, _index_version
+    version = menu_version()
+    if _index_version != version:
+        with _index_lock:
+            if _index_version != version:
+                version, items = get_menu_snapshot()
+                _index = MenuSearchIndex(items)
+                _index_version = version
+    return _index
+
+
+def search_menu(query: str, limit: int = 20, predicate=None) -> list:
+    return get_search_index().search(query, limit, predicate)
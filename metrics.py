@@ -0,0 +1,112 @@
+"""Prometheus metrics.
+
+Under gunicorn, ``PROMETHEUS_MULTIPROC_DIR`` (set by gunicorn.conf.py) makes
+prometheus_client keep every value in per-process mmap files, and
+``/metrics`` merges them so the scrape covers all workers. Without it the
+process-local default registry is used (flask run, tests).
+
+Recording is a dict lookup plus an in-memory/mmap float update, a few
+microseconds per call.
+"""
+
+import os
+import time
+
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from sql_instrumentation import get_request_stats
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    "cafe_http_requests_total", "HTTP requests", ["endpoint", "method", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "cafe_http_request_duration_seconds",
+    "HTTP request latency",
+    ["endpoint", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "cafe_http_request_db_seconds",
+    "Time spent in the database per request",
+    ["endpoint"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+ORDERS_CREATED = Counter("cafe_orders_created_total", "Orders created", ["mode"])
+EMAIL_OUTBOX = Gauge(
+    "cafe_email_outbox_depth", "Emails currently being sent", multiprocess_mode="livesum"
+)
+EMAIL_SEND_LATENCY = Histogram(
+    "cafe_email_send_seconds",
+    "SMTP send latency",
+    ["result"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+INVOICE_RENDER = Histogram(
+    "cafe_invoice_render_seconds",
+    "Invoice PDF render time",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOG_RECORDS_DROPPED = Counter(
+    "cafe_log_records_dropped_total", "Structured log records dropped on a full queue"
+)
+CACHE_LOOKUPS = Counter(
+    "cafe_cache_lookups_total", "Per-worker cache lookups", ["cache", "result"]
+)
+
+
+def _start_timer():
+    g._metrics_start = time.perf_counter()
+
+
+def _record_request(response):
+    start = g.pop("_metrics_start", None)
+    if start is None:
+        return response
+
+    endpoint = request.endpoint or "unmatched"
+    status = str(response.status_code)
+    REQUESTS.labels(endpoint, request.method, status).inc()
+    REQUEST_LATENCY.labels(endpoint, status).observe(time.perf_counter() - start)
+
+    stats = get_request_stats()
+    if stats is not None:
+        REQUEST_DB_TIME.labels(endpoint).observe(stats.total_ms / 1000.0)
+    return response
+
+
+def metrics_view():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app) -> None:
+    if not app.config.get("METRICS_ENABLED"):
+        return
+
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
+
+
+_ORDER_MODES = {"online", "offline", "dine-in", "takeaway", "delivery"}
+
+
+def record_order_created(mode: str) -> None:
+    # mode comes from a form field on the manual order page; bound the labels.
+    ORDERS_CREATED.labels(mode if mode in _ORDER_MODES else "other").inc()
@@ -0,0 +1,100 @@
+"""In-place schema upgrades for databases created before a column existed.
+
+``db.create_all()`` never alters existing tables, so columns added to the
+models are listed here and added with ``ALTER TABLE`` by ``flask upgrade-db``,
+followed by any data backfills.
+"""
+
+from sqlalchemy import inspect, select, text, update
+
+from extensions import db
+from models import InventoryItem, MenuItem, OrderItem
+
+# (table, column, DDL type) added after the table first shipped.
+COLUMN_ADDITIONS = [
+    ("order_item", "item_name", "VARCHAR(255)"),
+    ("order_item", "item_category", "VARCHAR(100)"),
+    ("inventory_item", "reorder_threshold", "INTEGER NOT NULL DEFAULT 10"),
+    ("inventory_item", "low_stock", "BOOLEAN NOT NULL DEFAULT FALSE"),
+]
+
+# Indexes on columns above; create_all only indexes tables it creates.
+INDEX_ADDITIONS = [
+    ("ix_inventory_item_low_stock", "inventory_item", "low_stock, stock"),
+]
+
+
+def add_missing_columns() -> list[str]:
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+
+    with db.engine.begin() as conn:
+        for table, column, ddl_type in COLUMN_ADDITIONS:
+            if table not in existing_tables:
+                continue
+            columns = {c["name"] for c in inspector.get_columns(table)}
+            if column in columns:
+                continue
+            conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN {column} {ddl_type}'))
+            added.append(f"{table}.{column}")
+
+    return added
+
+
+def add_missing_indexes() -> None:
+    with db.engine.begin() as conn:
+        for name, table, columns in INDEX_ADDITIONS:
+            conn.execute(text(f'CREATE INDEX IF NOT EXISTS {name} ON "{table}" ({columns})'))
+
+
+def backfill_low_stock() -> int:
+    result = db.session.execute(
+        update(InventoryItem)
+        .where(InventoryItem.low_stock != (InventoryItem.stock <= InventoryItem.reorder_threshold))
+        .values(low_stock=InventoryItem.stock <= InventoryItem.reorder_threshold)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def backfill_order_item_snapshots(batch_size: int = 5000) -> int:
+    """Copy name/category from menu_item into order lines that lack them.
+
+    Rows written before the snapshot existed can only get the menu item's
+    current name. Runs in id-range batches to keep each write transaction
+    short on a busy SQLite file.
+    """
+    name_sq = (
+        select(MenuItem.name).where(MenuItem.id == OrderItem.menu_item_id).scalar_subquery()
+    )
+    category_sq = (
+        select(MenuItem.category).where(MenuItem.id == OrderItem.menu_item_id).scalar_subquery()
+    )
+
+    max_id = db.session.execute(select(db.func.max(OrderItem.id))).scalar() or 0
+    updated = 0
+    for start in range(0, max_id, batch_size):
+        result = db.session.execute(
+            update(OrderItem)
+            .where(
+                OrderItem.id > start,
+                OrderItem.id <= start + batch_size,
+                OrderItem.item_name.is_(None),
+            )
+            .values(item_name=name_sq, item_category=category_sq)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        updated += result.rowcount
+    return updated
+
+
+def upgrade_db() -> None:
+    db.create_all()
+    for name in add_missing_columns():
+        print(f"Added column {name}")
+    add_missing_indexes()
+    print(f"Flagged low stock on {backfill_low_stock()} inventory items")
+    print(f"Backfilled {backfill_order_item_snapshots()} order item snapshots")
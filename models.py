@@ -4,6 +4,10 @@ from datetime import datetime
 
 from extensions import db
 
+# Integer columns are 32-bit on Postgres; user-supplied ids and counts are
+# checked against this before they reach the driver.
+MAX_INTEGER = 2**31 - 1
+
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -50,17 +54,33 @@ class OrderItem(db.Model):
     quantity = db.Column(db.Integer, nullable=False)
     unit_price_cents = db.Column(db.Integer, nullable=False)
     line_total_cents = db.Column(db.Integer, nullable=False)
+    # Snapshot of the menu item at order time; NULL only on rows that predate
+    # the columns and have not been backfilled yet (`flask upgrade-db`).
+    item_name = db.Column(db.String(255), nullable=True)
+    item_category = db.Column(db.String(100), nullable=True)
 
     order = db.relationship("Order", back_populates="items")
     menu_item = db.relationship("MenuItem")
 
+    @property
+    def display_name(self) -> str:
+        if self.item_name is not None:
+            return self.item_name
+        return self.menu_item.name
+
 
 class InventoryItem(db.Model):
+    # Serves the low-stock watchlist: WHERE low_stock ORDER BY stock.
+    __table_args__ = (db.Index("ix_inventory_item_low_stock", "low_stock", "stock"),)
+
     id = db.Column(db.Integer, primary_key=True)
     menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_item.id"), nullable=True)
     name = db.Column(db.String(255), nullable=False)
     stock = db.Column(db.Integer, nullable=False, default=0)
     last_restock = db.Column(db.DateTime, nullable=True)
+    reorder_threshold = db.Column(db.Integer, nullable=False, default=10)
+    # stock <= reorder_threshold, kept in step by every stock write (stock_watch.py).
+    low_stock = db.Column(db.Boolean, nullable=False, default=False)
 
     menu_item = db.relationship("MenuItem")
 
@@ -72,3 +92,25 @@ class Coupon(db.Model):
     min_order_cents = db.Column(db.Integer, nullable=False, default=0)
     max_discount_cents = db.Column(db.Integer, nullable=False, default=0)
     is_active = db.Column(db.Boolean, nullable=False, default=True)
+
+
+class RecipeComponent(db.Model):
+    """``quantity`` units of an inventory item used per unit of a menu item."""
+
+    __table_args__ = (db.UniqueConstraint("menu_item_id", "inventory_item_id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_item.id"), nullable=False, index=True)
+    inventory_item_id = db.Column(
+        db.Integer, db.ForeignKey("inventory_item.id"), nullable=False, index=True
+    )
+    quantity = db.Column(db.Integer, nullable=False)
+
+
+class CacheVersion(db.Model):
+    """Named version counters; see cache_utils.invalidate."""
+
+    __tablename__ = "cache_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
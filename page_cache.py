@@ -0,0 +1,262 @@
+"""Short-TTL full-page cache for anonymous visitors.
+
+Pages in ``CACHEABLE_ENDPOINTS`` are identical for every visitor without a
+login, cart or pending flash message, so for ``PAGE_CACHE_TTL`` seconds
+such GET requests are answered from a per-worker dict (and, with
+``PAGE_CACHE_SHARED_PATH``, a SQLite file shared by all workers) without
+running the view.
+
+Misses are coalesced: the first request for a key renders it while others
+wait up to ``PAGE_CACHE_WAIT`` seconds for the result, so a burst of
+identical requests costs one render per TTL per worker, or one overall when
+the shared store is enabled (its lease table elects a single renderer).
+If the shared store fails (locked past its timeout, disk full, file gone)
+the error is logged and the request carries on with the per-worker dict.
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, current_app, g, request, session
+
+from metrics import CACHE_LOOKUPS
+from profiling import PROFILE_HEADER
+
+CACHEABLE_ENDPOINTS = frozenset({"menu.index", "orders.track_form", "auth.login", "auth.register"})
+
+# Per-request values that must not be replayed to other visitors.
+_UNCACHED_HEADERS = {"set-cookie", "content-length", "x-page-cache"}
+
+_POLL_INTERVAL = 0.02
+# Renders are serialised per lock stripe rather than per key, so arbitrary
+# query strings cannot grow a lock table.
+_RENDER_STRIPES = 64
+
+
+class SharedPageStore:
+    """Cached pages and render leases in one SQLite file, for all workers."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS page (key TEXT PRIMARY KEY, expires REAL, "
+                "status INTEGER, headers TEXT, body BLOB)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS lease (key TEXT PRIMARY KEY, expires REAL)")
+
+    def _conn(self):
+        # One connection per thread (and per forked worker, via the pid).
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _failed(self, op: str, e: sqlite3.Error) -> None:
+        current_app.logger.warning(f"Shared page cache {op} failed: {e}")
+        # Reconnect next time, in case the file was replaced or the connection broke.
+        self._local.conn = None
+
+    def get(self, key: str):
+        try:
+            row = self._conn().execute(
+                "SELECT expires, status, headers, body FROM page WHERE key = ? AND expires > ?",
+                (key, time.time()),
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._failed("read", e)
+            return None
+        if row is None:
+            return None
+        expires, status, headers, body = row
+        return expires, status, [tuple(h.split(": ", 1)) for h in headers.split("\n") if h], body
+
+    def put(self, key: str, entry) -> None:
+        expires, status, headers, body = entry
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO page (key, expires, status, headers, body) VALUES (?, ?, ?, ?, ?)",
+                (key, expires, status, "\n".join(f"{k}: {v}" for k, v in headers), body),
+            )
+            if random.random() < 0.01:
+                conn.execute("DELETE FROM page WHERE expires < ?", (time.time(),))
+        except sqlite3.Error as e:
+            self._failed("write", e)
+
+    def try_lease(self, key: str, seconds: float) -> bool:
+        now = time.time()
+        try:
+            cur = self._conn().execute(
+                "INSERT INTO lease (key, expires) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET expires = excluded.expires WHERE lease.expires < ?",
+                (key, now + seconds, now),
+            )
+        except sqlite3.Error as e:
+            self._failed("lease", e)
+            # Render here rather than poll a store that is failing.
+            return True
+        return cur.rowcount == 1
+
+    def release(self, key: str) -> None:
+        try:
+            self._conn().execute("DELETE FROM lease WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            self._failed("release", e)
+
+
+class PageCache:
+    def __init__(self, ttl: float, max_entries: int, wait: float, shared: SharedPageStore | None = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.wait = wait
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._render_locks = [threading.Lock() for _ in range(_RENDER_STRIPES)]
+        self._lock = threading.Lock()
+        self._hits = CACHE_LOOKUPS.labels("page", "hit")
+        self._misses = CACHE_LOOKUPS.labels("page", "miss")
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.time():
+            return entry
+        if self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None:
+                self._store_local(key, entry)
+                return entry
+        return None
+
+    def _store_local(self, key: str, entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put(self, key: str, status: int, headers, body: bytes) -> None:
+        entry = (time.time() + self.ttl, status, headers, body)
+        self._store_local(key, entry)
+        if self.shared is not None:
+            self.shared.put(key, entry)
+
+    def lookup_or_lead(self, key: str):
+        """Return ``(entry, None)`` on a hit, else ``(None, ticket)``.
+
+        A miss means the caller should render the page and then pass the
+        ticket to ``release``, whether or not rendering succeeded.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            self._hits.inc()
+            return entry, None
+
+        # Other threads in this worker queue on the lock and re-check the cache.
+        render_lock = self._render_locks[hash(key) % _RENDER_STRIPES]
+        locked = render_lock.acquire(timeout=self.wait)
+        entry = self.get(key)
+        if entry is not None:
+            if locked:
+                render_lock.release()
+            self._hits.inc()
+            return entry, None
+
+        leased = False
+        if self.shared is not None:
+            leased = self.shared.try_lease(key, self.wait)
+            deadline = time.monotonic() + self.wait
+            # Another worker is rendering; poll the shared store briefly.
+            while not leased and time.monotonic() < deadline:
+                time.sleep(_POLL_INTERVAL)
+                entry = self.get(key)
+                if entry is not None:
+                    if locked:
+                        render_lock.release()
+                    self._hits.inc()
+                    return entry, None
+
+        self._misses.inc()
+        return None, (key, render_lock if locked else None, leased)
+
+    def release(self, ticket) -> None:
+        key, render_lock, leased = ticket
+        if leased:
+            self.shared.release(key)
+        if render_lock is not None:
+            render_lock.release()
+
+
+def _is_cacheable() -> bool:
+    return (
+        request.method == "GET"
+        and request.endpoint in CACHEABLE_ENDPOINTS
+        and PROFILE_HEADER not in request.headers
+        and not session.get("user_id")
+        and not session.get("cart")
+        and not session.get("_flashes")
+    )
+
+
+def _serve_cached():
+    if not _is_cacheable():
+        return None
+
+    cache = current_app.extensions["page_cache"]
+    key = request.full_path
+    entry, ticket = cache.lookup_or_lead(key)
+    if entry is not None:
+        _, status, headers, body = entry
+        response = Response(body, status=status, headers=headers)
+        response.headers["X-Page-Cache"] = "HIT"
+        return response
+
+    g._page_cache_ticket = ticket
+    return None
+
+
+def _store_rendered(response):
+    ticket = g.get("_page_cache_ticket")
+    if ticket is None:
+        return response
+
+    # Storing must not depend on what the view did to the session: a page
+    # that added a flash or wrote a cart is per-visitor.
+    if response.status_code == 200 and not response.direct_passthrough and not session.modified:
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _UNCACHED_HEADERS]
+        current_app.extensions["page_cache"].put(ticket[0], response.status_code, headers, response.get_data())
+    response.headers["X-Page-Cache"] = "MISS"
+    return response
+
+
+def _release(exc):
+    ticket = g.pop("_page_cache_ticket", None)
+    if ticket is not None:
+        current_app.extensions["page_cache"].release(ticket)
+
+
+def init_page_cache(app) -> None:
+    ttl = app.config["PAGE_CACHE_TTL"]
+    if ttl <= 0:
+        return
+
+    shared_path = app.config["PAGE_CACHE_SHARED_PATH"]
+    app.extensions["page_cache"] = PageCache(
+        ttl,
+        app.config["PAGE_CACHE_MAX_ENTRIES"],
+        app.config["PAGE_CACHE_WAIT"],
+        SharedPageStore(shared_path) if shared_path else None,
+    )
+    app.before_request(_serve_cached)
+    app.after_request(_store_rendered)
+    app.teardown_request(_release)
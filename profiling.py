@@ -0,0 +1,134 @@
+"""Opt-in per-request cProfile capture.
+
+A request is profiled when it carries a valid signed ``X-Profile`` header
+(see ``make_profile_token``) or is picked by ``PROFILE_SAMPLE_RATE``. The
+stats file is written to ``PROFILE_DIR`` as
+``<timestamp>-<duration>ms-<endpoint>-<pid>.prof``; only the newest
+``PROFILE_MAX_FILES`` are kept. Open them with ``python -m pstats`` or
+snakeviz, or browse the summaries at ``/staff/profiles``.
+"""
+
+import cProfile
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from io import StringIO
+
+from flask import current_app, g, request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+PROFILE_HEADER = "X-Profile"
+
+_FILENAME_RE = re.compile(r"^(\d{8}T\d{6})-(\d+)ms-(.+)-(\d+)\.prof$")
+
+# Only one cProfile collector can be active per interpreter at a time.
+_active = threading.Lock()
+
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.config["SECRET_KEY"], salt="request-profile")
+
+
+def make_profile_token() -> str:
+    return _serializer().dumps("profile")
+
+
+def _has_valid_token() -> bool:
+    token = request.headers.get(PROFILE_HEADER)
+    if not token:
+        return False
+    try:
+        _serializer().loads(token, max_age=current_app.config["PROFILE_TOKEN_MAX_AGE"])
+        return True
+    except BadSignature:
+        return False
+
+
+def profile_dir() -> str:
+    return current_app.config["PROFILE_DIR"] or os.path.join(current_app.instance_path, "profiles")
+
+
+def _start_profile():
+    rate = current_app.config["PROFILE_SAMPLE_RATE"]
+    sampled = rate > 0 and random.random() < rate
+    if not (sampled or _has_valid_token()):
+        return
+    if not _active.acquire(blocking=False):
+        return
+
+    profiler = cProfile.Profile()
+    g._profile = (profiler, time.perf_counter())
+    profiler.enable()
+
+
+def _finish_profile(exc):
+    state = g.pop("_profile", None)
+    if state is None:
+        return
+
+    profiler, start = state
+    try:
+        profiler.disable()
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+        _save(profiler, elapsed_ms)
+    except Exception as e:
+        current_app.logger.error(f"Failed to save request profile: {e}")
+    finally:
+        _active.release()
+
+
+def _save(profiler, elapsed_ms: int) -> None:
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    endpoint = re.sub(r"[^A-Za-z0-9_.]", "_", request.endpoint or "unmatched")
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{elapsed_ms}ms-{endpoint}-{os.getpid()}.prof"
+    profiler.dump_stats(os.path.join(directory, name))
+
+    captures = sorted(
+        (f for f in os.listdir(directory) if f.endswith(".prof")),
+        key=lambda f: os.path.getmtime(os.path.join(directory, f)),
+    )
+    for old in captures[: max(0, len(captures) - current_app.config["PROFILE_MAX_FILES"])]:
+        try:
+            os.remove(os.path.join(directory, old))
+        except OSError:
+            pass
+
+
+def list_captures(limit: int = 20, top: int = 10) -> list[dict]:
+    """Newest captures first, each with its top functions by cumulative time."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+
+    names = sorted((f for f in os.listdir(directory) if _FILENAME_RE.match(f)), reverse=True)
+    captures = []
+    for name in names[:limit]:
+        stamp, duration_ms, endpoint, pid = _FILENAME_RE.match(name).groups()
+        out = StringIO()
+        try:
+            stats = pstats.Stats(os.path.join(directory, name), stream=out)
+            stats.sort_stats("cumulative").print_stats(top)
+        except Exception as e:
+            out.write(f"Could not read profile: {e}")
+        captures.append({
+            "name": name,
+            "timestamp": stamp,
+            "duration_ms": int(duration_ms),
+            "endpoint": endpoint,
+            "pid": int(pid),
+            "summary": out.getvalue().strip(),
+        })
+    return captures
+
+
+def init_profiling(app) -> None:
+    if not app.config.get("PROFILING_ENABLED"):
+        return
+
+    app.before_request(_start_profile)
+    app.teardown_request(_finish_profile)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Query-count regression checks for order views.
+
+Builds the app against a throwaway SQLite database with SQL instrumentation
+on, places a multi-line order and asserts that each order view stays within
+its query budget regardless of how many lines the order has.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmpdir = tempfile.mkdtemp(prefix="cafe_query_checks_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'checks.db')}"
+os.environ["SQL_INSTRUMENTATION"] = "true"
+os.environ["GMAIL_EMAIL"] = ""
+
+from flask import g  # noqa: E402
+
+from app import create_app  # noqa: E402
+from extensions import db  # noqa: E402
+from sql_instrumentation import RequestSQLStats  # noqa: E402
+
+# endpoint -> maximum queries for the whole request
+QUERY_BUDGETS = {
+    "orders.success": 1,
+    "orders.order_status": 2,
+    "staff.invoice_pdf": 2,
+    "email.order_confirmation": 2,
+}
+
+ORDER_LINES = 6
+
+
+def _place_order(app) -> int:
+    from models import MenuItem, Order, OrderItem
+
+    with app.app_context():
+        db.create_all()
+        items = [
+            MenuItem(name=f"Item {i}", category="Checks", price_cents=1000 * i)
+            for i in range(1, ORDER_LINES + 1)
+        ]
+        db.session.add_all(items)
+        db.session.flush()
+
+        order = Order(
+            customer_name="Query Check",
+            customer_phone="-",
+            customer_email="checks@example.com",
+            mode="offline",
+            status="completed",
+            subtotal_cents=0,
+            total_cents=0,
+        )
+        for mi in items:
+            order.items.append(
+                OrderItem(menu_item_id=mi.id, quantity=1, unit_price_cents=mi.price_cents,
+                          line_total_cents=mi.price_cents, item_name=mi.name,
+                          item_category=mi.category)
+            )
+        db.session.add(order)
+        db.session.commit()
+        return order.id
+
+
+def _check_views(app, order_id: int) -> dict:
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["user_id"] = 1
+        sess["role"] = "staff"
+
+    urls = {
+        "orders.success": f"/orders/success/{order_id}",
+        "orders.order_status": f"/orders/{order_id}",
+        "staff.invoice_pdf": f"/staff/invoices/{order_id}.pdf",
+    }
+    counts = {}
+    for endpoint, url in urls.items():
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}")
+        counts[endpoint] = int(response.headers["X-DB-Queries"])
+    return counts
+
+
+def _check_email(app, order_id: int) -> int:
+    from email_utils import send_order_confirmation_email
+    from loader_profiles import load_order
+
+    with app.test_request_context():
+        g._sql_stats = RequestSQLStats()
+        send_order_confirmation_email(load_order(order_id, "order_detail"))
+        return g._sql_stats.count
+
+
+def run_query_checks() -> bool:
+    app = create_app()
+    order_id = _place_order(app)
+
+    counts = _check_views(app, order_id)
+    counts["email.order_confirmation"] = _check_email(app, order_id)
+
+    all_passed = True
+    for endpoint, budget in QUERY_BUDGETS.items():
+        count = counts[endpoint]
+        ok = count <= budget
+        all_passed = all_passed and ok
+        print(f"[{'PASS' if ok else 'FAIL'}] {endpoint}: {count} queries (budget {budget})")
+    return all_passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_query_checks() else 1)
@@ -0,0 +1,212 @@
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import wraps
+
+from flask import current_app, render_template, request
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets held in process memory.
+
+    Each key refills at ``rate`` tokens per second up to ``capacity``. Idle
+    buckets are pruned once more than ``max_keys`` are tracked, so a flood
+    of distinct keys cannot grow memory without bound.
+    """
+
+    def __init__(self, rate: float, capacity: int, max_keys: int = 10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key: str) -> float:
+        """Take one token for ``key``.
+
+        Returns 0 when the call is allowed, otherwise the number of seconds
+        until a token becomes available.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                tokens = float(self.capacity)
+            else:
+                tokens, last = bucket
+                tokens = min(self.capacity, tokens + (now - last) * self.rate)
+
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return 0.0
+
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / self.rate
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        full_after = self.capacity / self.rate
+        stale = [k for k, (_, last) in self._buckets.items() if now - last >= full_after]
+        for k in stale:
+            del self._buckets[k]
+        if len(self._buckets) >= self.max_keys:
+            # Everyone is active; drop the oldest half rather than refuse new keys.
+            by_age = sorted(self._buckets.items(), key=lambda kv: kv[1][1])
+            for k, _ in by_age[: len(by_age) // 2]:
+                del self._buckets[k]
+
+
+class HashingSaturated(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing capacity exhausted")
+        self.retry_after = retry_after
+
+
+class BoundedHasher:
+    """Runs password hashing on a small, bounded thread pool.
+
+    At most ``max_workers`` hashes run at once and at most ``max_pending``
+    more may wait; anything beyond that is rejected immediately with
+    ``HashingSaturated`` instead of queueing behind the attack. hashlib
+    releases the GIL, so request threads serving orders keep running while
+    the pool is busy.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, timeout: float):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads do not survive fork, so each gunicorn worker builds its own pool.
+        pid = os.getpid()
+        if self._executor is None or self._pid != pid:
+            with self._lock:
+                if self._executor is None or self._pid != pid:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="pwhash"
+                    )
+                    self._pid = pid
+        return self._executor
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingSaturated(retry_after=max(1, math.ceil(self.timeout)))
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise HashingSaturated(retry_after=max(1, math.ceil(self.timeout)))
+
+
+_ip_limiter = None
+_email_limiter = None
+_account_limiter = None
+_hasher = None
+_init_lock = threading.Lock()
+
+
+def _init_from_config() -> None:
+    global _ip_limiter, _email_limiter, _account_limiter, _hasher
+
+    with _init_lock:
+        if _hasher is not None:
+            return
+        cfg = current_app.config
+        _ip_limiter = TokenBucketLimiter(
+            rate=cfg["AUTH_IP_PER_MINUTE"] / 60.0,
+            capacity=cfg["AUTH_IP_BURST"],
+        )
+        _email_limiter = TokenBucketLimiter(
+            rate=cfg["AUTH_EMAIL_PER_MINUTE"] / 60.0,
+            capacity=cfg["AUTH_EMAIL_BURST"],
+        )
+        _account_limiter = TokenBucketLimiter(
+            rate=cfg["AUTH_ACCOUNT_PER_MINUTE"] / 60.0,
+            capacity=cfg["AUTH_ACCOUNT_BURST"],
+        )
+        _hasher = BoundedHasher(
+            max_workers=cfg["PASSWORD_HASH_WORKERS"],
+            max_pending=cfg["PASSWORD_HASH_QUEUE"],
+            timeout=cfg["PASSWORD_HASH_TIMEOUT"],
+        )
+
+
+def _too_many_requests(retry_after: float):
+    retry_after = max(1, math.ceil(retry_after))
+    body = render_template("errors/429.html", retry_after=retry_after)
+    return body, 429, {"Retry-After": str(retry_after)}
+
+
+def service_unavailable(retry_after: int):
+    body = render_template("errors/503.html", retry_after=retry_after)
+    return body, 503, {"Retry-After": str(retry_after)}
+
+
+def throttle_auth(fn):
+    """Reject auth form posts that exceed the per-IP or per-email budgets.
+
+    An email is limited per IP, so guessing from one address cannot lock the
+    account out for everyone, and more loosely across all IPs, which only a
+    distributed attack reaches. Runs before any password hashing so a
+    rejected attempt costs only a dict lookup.
+    """
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not current_app.config.get("AUTH_RATE_LIMIT_ENABLED", True):
+            return fn(*args, **kwargs)
+        if _hasher is None:
+            _init_from_config()
+
+        wait = _ip_limiter.consume(request.remote_addr or "-")
+        if wait:
+            current_app.logger.warning(f"Auth rate limit hit for ip {request.remote_addr}")
+            return _too_many_requests(wait)
+
+        email = (request.form.get("email") or "").strip().lower()
+        if email:
+            wait = _email_limiter.consume(f"{request.remote_addr or '-'} {email}")
+            if wait:
+                current_app.logger.warning(f"Auth rate limit hit for email {email} from ip {request.remote_addr}")
+                return _too_many_requests(wait)
+            wait = _account_limiter.consume(email)
+            if wait:
+                current_app.logger.warning(f"Auth rate limit hit for email {email} across all ips")
+                return _too_many_requests(wait)
+
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def hash_password(password: str) -> str:
+    if _hasher is None:
+        _init_from_config()
+    return _hasher.run(generate_password_hash, password)
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    if _hasher is None:
+        _init_from_config()
+    return _hasher.run(check_password_hash, password_hash, password)
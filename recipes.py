@@ -0,0 +1,191 @@
+"""Recipes (bill of materials) and order-time inventory depletion.
+
+``RecipeComponent`` rows form a sparse matrix R of menu items x inventory
+items (cached per worker by ``cache_utils.get_recipe_matrix``; items
+without a recipe fall back to one unit of their linked inventory row). For
+order lines q (menu item -> quantity) the stock to take is the vector
+q . R, computed by walking only the non-zero entries, and applied in one
+statement of constant shape however many orders and lines it covers: an
+executemany UPDATE (one prepared statement, one row of parameters per
+ingredient). On Postgres, ``DB_DEPLETE_WITH_ARRAYS`` switches to a single
+``UPDATE ... FROM unnest(:ids, :amounts)`` taking the whole vector as two
+arrays, one round trip rather than one per ingredient; it is off by default
+until benchmarks/recipes.py and benchmarks/stress.py have been run with it
+against a real server.
+
+A single ``SET stock = stock - CASE id WHEN ...`` statement was measured
+too (benchmarks/recipes.py) and lost badly on SQLite: the statement differs
+for every vector, so it is compiled and prepared every time.
+"""
+
+import csv
+import io
+from collections import defaultdict
+
+from flask import current_app
+from sqlalchemy import Integer, bindparam, case, column, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from cache_utils import bump_version, get_recipe_matrix
+from extensions import db
+from models import MAX_INTEGER, InventoryItem, MenuItem, RecipeComponent
+from stock_watch import crossed_threshold, disable_menu_items, low_stock_expr
+
+# Per unit of a menu item; depletion amounts are further capped at the
+# stock column's range (stock never goes below zero anyway).
+MAX_RECIPE_QUANTITY = 1_000_000
+
+_inventory = InventoryItem.__table__
+_remaining = _inventory.c.stock - bindparam("amount")
+_new_stock = case((_remaining < 0, 0), else_=_remaining)
+DEPLETE_STOCK = (
+    update(_inventory)
+    .where(_inventory.c.id == bindparam("b_id"))
+    .values(stock=_new_stock, low_stock=low_stock_expr(_new_stock))
+)
+
+# Postgres: the vector as two arrays. The rows are locked in id order in
+# the subquery, as the sorted executemany does, so concurrent batches
+# cannot deadlock.
+_vector = func.unnest(
+    bindparam("ids", type_=ARRAY(Integer)), bindparam("amounts", type_=ARRAY(Integer))
+).table_valued(column("id", Integer), column("amount", Integer)).render_derived(name="vector")
+_locked = _inventory.alias("locked")
+_batch = (
+    select(_locked.c.id, _vector.c.amount)
+    .join(_vector, _locked.c.id == _vector.c.id)
+    .order_by(_locked.c.id)
+    .with_for_update(of=_locked)
+    .subquery("batch")
+)
+_batch_remaining = _inventory.c.stock - _batch.c.amount
+_batch_stock = case((_batch_remaining < 0, 0), else_=_batch_remaining)
+DEPLETE_STOCK_ARRAYS = (
+    update(_inventory)
+    .where(_inventory.c.id == _batch.c.id)
+    .values(stock=_batch_stock, low_stock=low_stock_expr(_batch_stock))
+)
+
+
+def depletion_vector(lines, matrix) -> dict[int, int]:
+    """Sum ``quantity x recipe`` over ``(menu_item_id, quantity)`` lines."""
+    totals = defaultdict(int)
+    for menu_item_id, quantity in lines:
+        for inventory_item_id, per_unit in matrix.get(menu_item_id, ()):
+            totals[inventory_item_id] += quantity * per_unit
+    return totals
+
+
+def menu_items_using(inventory_item_ids, matrix=None) -> list[int]:
+    """Menu items whose recipe needs any of ``inventory_item_ids``."""
+    wanted = set(inventory_item_ids)
+    if not wanted:
+        return []
+    if matrix is None:
+        matrix = get_recipe_matrix()
+    return [
+        menu_item_id
+        for menu_item_id, components in matrix.items()
+        if any(inventory_item_id in wanted for inventory_item_id, _ in components)
+    ]
+
+
+def apply_depletion(totals: dict, track_crossings: bool = False, use_arrays: bool = False) -> list[int]:
+    """Take ``totals`` off stock, never below zero.
+
+    With ``track_crossings`` returns the ids that became low, at the cost of
+    two extra SELECTs. ``use_arrays`` selects the Postgres-only arrays
+    statement; other backends ignore it.
+    """
+    # Sorted ids: concurrent batches lock rows in the same order on Postgres.
+    params = [{"b_id": i, "amount": min(q, MAX_INTEGER)} for i, q in sorted(totals.items()) if q]
+    if not params:
+        return []
+
+    ids = [p["b_id"] for p in params]
+    previously_low = set()
+    if track_crossings:
+        previously_low = set(db.session.scalars(
+            db.select(InventoryItem.id).where(InventoryItem.id.in_(ids), InventoryItem.low_stock.is_(True))
+        ))
+    if use_arrays and db.engine.dialect.name == "postgresql":
+        db.session.execute(DEPLETE_STOCK_ARRAYS, {"ids": ids, "amounts": [p["amount"] for p in params]})
+    else:
+        db.session.execute(DEPLETE_STOCK, params)
+    return crossed_threshold(ids, previously_low) if track_crossings else []
+
+
+def deplete_inventory(lines) -> None:
+    """Deplete stock for the order lines of one or many orders, in the caller's transaction."""
+    matrix = get_recipe_matrix()
+    config = current_app.config
+    crossed = apply_depletion(
+        depletion_vector(lines, matrix),
+        track_crossings=config["LOW_STOCK_DISABLES_MENU"],
+        use_arrays=config["DB_DEPLETE_WITH_ARRAYS"],
+    )
+    disable_menu_items(menu_items_using(crossed, matrix))
+
+
+def parse_recipe_lines(text: str) -> list[tuple[int, int, int]]:
+    """``menu_item_id,inventory_item_id,quantity`` rows; a header row is skipped."""
+    rows = []
+    for line, row in enumerate(csv.reader(io.StringIO(text)), start=1):
+        cells = [c.strip() for c in row]
+        if not any(cells):
+            continue
+        if line == 1 and not cells[0].isdigit():
+            continue
+        try:
+            menu_item_id, inventory_item_id, quantity = (int(c) for c in cells[:3])
+        except ValueError:
+            raise ValueError(f"Line {line}: expected menu_item_id,inventory_item_id,quantity.") from None
+        for name, value in (("menu_item_id", menu_item_id), ("inventory_item_id", inventory_item_id)):
+            if not 1 <= value <= MAX_INTEGER:
+                raise ValueError(f"Line {line}: {name} must be between 1 and {MAX_INTEGER}.")
+        if not 0 <= quantity <= MAX_RECIPE_QUANTITY:
+            raise ValueError(f"Line {line}: quantity must be between 0 and {MAX_RECIPE_QUANTITY}.")
+        rows.append((menu_item_id, inventory_item_id, quantity))
+    return rows
+
+
+def replace_recipes(rows) -> int:
+    """Replace the recipes of every menu item in ``rows``; returns the component count.
+
+    A quantity of 0 clears that component; a menu item whose rows are all 0
+    goes back to its direct inventory link.
+    """
+    components = {}
+    for menu_item_id, inventory_item_id, quantity in rows:
+        components[(menu_item_id, inventory_item_id)] = quantity
+    menu_item_ids = {m for m, _ in components}
+    if not menu_item_ids:
+        return 0
+    inventory_item_ids = {i for _, i in components}
+    missing_menu = menu_item_ids - set(db.session.scalars(
+        db.select(MenuItem.id).where(MenuItem.id.in_(menu_item_ids))
+    ))
+    missing_inventory = inventory_item_ids - set(db.session.scalars(
+        db.select(InventoryItem.id).where(InventoryItem.id.in_(inventory_item_ids))
+    ))
+    if missing_menu or missing_inventory:
+        raise ValueError(
+            "Unknown ids: "
+            + "; ".join(
+                f"{kind} {', '.join(map(str, sorted(ids)))}"
+                for kind, ids in (("menu items", missing_menu), ("inventory items", missing_inventory))
+                if ids
+            )
+        )
+
+    db.session.execute(delete(RecipeComponent).where(RecipeComponent.menu_item_id.in_(menu_item_ids)))
+    params = [
+        {"menu_item_id": m, "inventory_item_id": i, "quantity": q}
+        for (m, i), q in components.items()
+        if q
+    ]
+    if params:
+        db.session.execute(insert(RecipeComponent.__table__), params)
+    bump_version("recipes")
+    db.session.commit()
+    return len(params)
@@ -0,0 +1,133 @@
+"""Opt-in per-request SQL instrumentation.
+
+When ``SQL_INSTRUMENTATION`` is enabled, engine events count every statement
+executed while a request is being handled, total the time spent in the
+database, and group statements by fingerprint. Each response then carries
+``X-DB-Queries``/``X-DB-Time-ms``/``Server-Timing`` headers and a log line;
+statements slower than ``SLOW_QUERY_MS`` and fingerprints repeated at least
+``N_PLUS_ONE_THRESHOLD`` times (the lazy-load-per-row pattern) are logged as
+warnings.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+_WS_RE = re.compile(r"\s+")
+# "IN (?, ?, ?)" / "IN (%(a)s, %(b)s)" collapse to one shape regardless of length.
+_IN_LIST_RE = re.compile(r"\bIN \((?:[?]|%\(\w+\)s|:\w+)(?:, (?:[?]|%\(\w+\)s|:\w+))*\)", re.IGNORECASE)
+
+
+def fingerprint(statement: str) -> str:
+    normalized = _WS_RE.sub(" ", statement).strip()
+    return _IN_LIST_RE.sub("IN (...)", normalized)
+
+
+class RequestSQLStats:
+    """Query count and DB time for one request.
+
+    ``fingerprints`` is None when only the totals are wanted (metrics
+    without ``SQL_INSTRUMENTATION``), which skips the per-statement regex.
+    """
+
+    __slots__ = ("count", "total_ms", "fingerprints")
+
+    def __init__(self, detailed: bool = True):
+        self.count = 0
+        self.total_ms = 0.0
+        self.fingerprints = Counter() if detailed else None
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+
+def get_request_stats():
+    """Stats for the current request, or None outside a request or when disabled."""
+    if not has_request_context():
+        return None
+    return g.get("_sql_stats")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("_query_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000.0
+
+    stats = get_request_stats()
+    if stats is None:
+        return
+
+    stats.count += 1
+    stats.total_ms += elapsed_ms
+    if stats.fingerprints is None:
+        return
+    stats.fingerprints[fingerprint(statement)] += 1
+
+    if elapsed_ms >= current_app.config["SLOW_QUERY_MS"]:
+        current_app.logger.warning(
+            f"Slow query ({elapsed_ms:.1f} ms) on {request.endpoint}: "
+            f"{fingerprint(statement)[:500]} params={str(parameters)[:200]}"
+        )
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("_query_start"):
+        conn.info["_query_start"].pop()
+
+
+def _start_request():
+    g._sql_stats = RequestSQLStats(detailed=current_app.config["SQL_INSTRUMENTATION"])
+
+
+def _finish_request(response):
+    # Left on g (it goes with the request) so the metrics hook can read it
+    # whichever after_request function runs first.
+    stats = g.get("_sql_stats")
+    if stats is None or stats.fingerprints is None:
+        return response
+
+    response.headers["X-DB-Queries"] = str(stats.count)
+    response.headers["X-DB-Time-ms"] = f"{stats.total_ms:.2f}"
+    response.headers.add("Server-Timing", f"db;dur={stats.total_ms:.2f};desc=\"{stats.count} queries\"")
+
+    current_app.logger.info(
+        f"sql endpoint={request.endpoint} status={response.status_code} "
+        f"queries={stats.count} db_ms={stats.total_ms:.2f}"
+    )
+
+    for fp, n in stats.repeated(current_app.config["N_PLUS_ONE_THRESHOLD"]):
+        current_app.logger.warning(
+            f"Possible N+1 on {request.endpoint}: statement ran {n} times: {fp[:500]}"
+        )
+
+    return response
+
+
+def init_sql_instrumentation(app, engine) -> None:
+    """Install the engine/request hooks.
+
+    Totals are also collected when only ``METRICS_ENABLED`` is set, so the
+    metrics layer can report DB time per request.
+    """
+    if not (app.config.get("SQL_INSTRUMENTATION") or app.config.get("METRICS_ENABLED")):
+        return
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+    if app.config.get("SQL_INSTRUMENTATION") and app.logger.level == logging.NOTSET:
+        # The per-request summary is logged at INFO.
+        app.logger.setLevel(logging.INFO)
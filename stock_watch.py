@@ -0,0 +1,75 @@
+"""Low-stock watchlist.
+
+``InventoryItem.low_stock`` mirrors ``stock <= reorder_threshold`` and is
+updated by each code path that writes stock, so the watchlist is a range
+scan of ``ix_inventory_item_low_stock`` rather than a pass over the whole
+inventory. With ``LOW_STOCK_DISABLES_MENU`` on, an item that newly crosses
+its threshold also takes the menu items that use it (see recipes.py) off
+sale, online and offline, and bumps the menu cache version. Restocking
+does not put items back on sale; staff do that from the Bulk Menu page.
+"""
+
+from flask import current_app
+
+from cache_utils import bump_version
+from extensions import db
+from models import InventoryItem, MenuItem
+
+
+def set_stock(inv: InventoryItem, stock: int) -> bool:
+    """Set ``inv.stock`` and its flag; True if it has just become low."""
+    inv.stock = stock
+    was_low = inv.low_stock
+    inv.low_stock = stock <= inv.reorder_threshold
+    return inv.low_stock and not was_low
+
+
+def low_stock_expr(stock, table=InventoryItem.__table__):
+    return stock <= table.c.reorder_threshold
+
+
+def crossed_threshold(item_ids, previously_low) -> list[int]:
+    """Those of ``item_ids`` that are low now but were not before."""
+    if not item_ids:
+        return []
+    now_low = db.session.scalars(
+        db.select(InventoryItem.id).where(InventoryItem.id.in_(item_ids), InventoryItem.low_stock.is_(True))
+    )
+    return [item_id for item_id in now_low if item_id not in previously_low]
+
+
+def disable_menu_items(menu_item_ids) -> int:
+    """Take newly low items off sale, if configured; runs in the caller's transaction."""
+    if not menu_item_ids or not current_app.config["LOW_STOCK_DISABLES_MENU"]:
+        return 0
+    count = db.session.execute(
+        db.update(MenuItem)
+        .where(
+            MenuItem.id.in_(menu_item_ids),
+            db.or_(MenuItem.is_available_online.is_(True), MenuItem.is_available_offline.is_(True)),
+        )
+        .values(is_available_online=False, is_available_offline=False)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if count:
+        bump_version("menu")
+    return count
+
+
+def low_stock_items() -> list:
+    """The watchlist, most urgent first."""
+    return db.session.execute(
+        db.select(
+            InventoryItem.id,
+            InventoryItem.name,
+            InventoryItem.stock,
+            InventoryItem.reorder_threshold,
+            InventoryItem.last_restock,
+            MenuItem.id.label("menu_item_id"),
+            MenuItem.is_available_online,
+            MenuItem.is_available_offline,
+        )
+        .outerjoin(MenuItem, MenuItem.id == InventoryItem.menu_item_id)
+        .where(InventoryItem.low_stock.is_(True))
+        .order_by(InventoryItem.stock.asc(), InventoryItem.id.asc())
+    ).all()
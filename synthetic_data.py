@@ -0,0 +1,281 @@
+"""Large-volume synthetic data for ``flask seed-synthetic``.
+
+Orders are generated in fixed-size chunks, each from its own RNG seeded with
+``(seed, chunk)``, and carry explicit ids derived from the chunk number, so
+the rows are identical whatever the worker count or shard layout. Rows go in
+with bulk Core ``INSERT`` executemany batches, one transaction per batch.
+
+Targets are either the app database or ``--shards`` SQLite files (chunk k
+lands in shard k % N, each shard gets the full menu). A SQLite file only
+ever has one writer; Postgres targets are split across ``--workers``
+processes by chunk.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from db_profiles import install_sqlite_pragmas
+from extensions import db
+from models import InventoryItem, MenuItem, Order, OrderItem
+
+# Relative order volume per hour of day: breakfast, lunch and evening peaks.
+HOUR_WEIGHTS = [
+    0.1, 0.05, 0.02, 0.02, 0.05, 0.2, 1.0, 3.0, 6.0, 7.0, 5.0, 4.0,
+    6.5, 7.0, 4.5, 3.0, 3.5, 5.0, 6.0, 5.5, 3.5, 2.0, 1.0, 0.4,
+]
+# Monday first; weekends are busier.
+WEEKDAY_WEIGHTS = [0.9, 0.85, 0.9, 0.95, 1.1, 1.35, 1.3]
+
+CATEGORIES = {
+    "Coffee": (12000, 32000),
+    "Tea": (8000, 20000),
+    "Snacks": (10000, 28000),
+    "Desserts": (12000, 30000),
+    "Meals": (25000, 60000),
+    "Juices": (10000, 24000),
+}
+ADJECTIVES = ["Classic", "Iced", "Spiced", "Double", "House", "Smoked", "Honey", "Masala", "Vanilla", "Hazelnut"]
+NOUNS = {
+    "Coffee": ["Latte", "Americano", "Mocha", "Flat White", "Cortado", "Cold Brew"],
+    "Tea": ["Chai", "Green Tea", "Earl Grey", "Lemon Tea", "Kahwa"],
+    "Snacks": ["Sandwich", "Samosa", "Croissant", "Wrap", "Toastie", "Puff"],
+    "Desserts": ["Brownie", "Cheesecake", "Muffin", "Tart", "Cookie"],
+    "Meals": ["Pasta", "Rice Bowl", "Burger", "Thali", "Salad"],
+    "Juices": ["Orange Juice", "Smoothie", "Lemonade", "Shake"],
+}
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Meera", "Kabir", "Ananya", "Rohan", "Sara", "Vikram", "Priya", "Arjun", "Nisha"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Khan", "Das", "Reddy", "Gupta", "Singh", "Nair", "Joshi"]
+
+# (mode, weight, [(status, weight)], [payment modes])
+MODES = [
+    ("online", 45, [("completed", 80), ("confirmed", 10), ("pending", 3), ("cancelled", 7)], [None]),
+    ("offline", 35, [("completed", 1)], ["cash", "upi", "card"]),
+    ("dine-in", 10, [("completed", 95), ("cancelled", 5)], ["cash", "upi", "card"]),
+    ("takeaway", 7, [("completed", 95), ("cancelled", 5)], ["cash", "upi"]),
+    ("delivery", 3, [("completed", 90), ("cancelled", 10)], ["upi", "card"]),
+]
+LINES_PER_ORDER = ([1, 2, 3, 4, 5], [40, 30, 17, 9, 4])
+COUPON = ("FUSION10", 10, 30000, 5000)  # code, percent, min order, max discount
+COUPON_RATE = 0.05
+
+
+def generate_menu(count: int, seed: int, start_id: int) -> list[dict]:
+    rng = random.Random(f"{seed}-menu")
+    categories = list(CATEGORIES)
+    rows = []
+    for i in range(count):
+        category = categories[i % len(categories)]
+        low, high = CATEGORIES[category]
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS[category])} #{i + 1}"
+        rows.append({
+            "id": start_id + i,
+            "name": name,
+            "category": category,
+            "price_cents": rng.randrange(low, high, 500),
+            "is_available_online": rng.random() < 0.9,
+            "is_available_offline": True,
+            "tags": None,
+        })
+    return rows
+
+
+def _popularity_cum_weights(menu: list[dict], seed: int) -> list[float]:
+    """Zipf-like popularity over a seeded shuffle of the menu."""
+    ranks = list(range(1, len(menu) + 1))
+    random.Random(f"{seed}-popularity").shuffle(ranks)
+    return list(accumulate(1.0 / r ** 1.1 for r in ranks))
+
+
+def _generate_chunk(chunk: int, params: dict) -> tuple[list[dict], list[dict]]:
+    rng = random.Random(f"{params['seed']}-orders-{chunk}")
+    menu = params["menu"]
+    cum_weights = params["cum_weights"]
+    end = params["end"]
+    days = params["days"]
+
+    day_weights = [WEEKDAY_WEIGHTS[(end - timedelta(days=d + 1)).weekday()] for d in range(days)]
+    day_cum = list(accumulate(day_weights))
+    hour_cum = list(accumulate(HOUR_WEIGHTS))
+    mode_cum = list(accumulate(m[1] for m in MODES))
+    mode_status = [(m[0], [s for s, _ in m[2]], list(accumulate(w for _, w in m[2])), m[3]) for m in MODES]
+    line_counts, line_weights = LINES_PER_ORDER
+    line_cum = list(accumulate(line_weights))
+    code, percent, min_cents, max_discount = COUPON
+
+    first_id = params["order_id_offset"] + chunk * params["chunk_size"] + 1
+    count = min(params["chunk_size"], params["orders"] - chunk * params["chunk_size"])
+    orders, items = [], []
+    for order_id in range(first_id, first_id + count):
+        day = rng.choices(range(days), cum_weights=day_cum)[0]
+        hour = rng.choices(range(24), cum_weights=hour_cum)[0]
+        created_at = end - timedelta(days=day + 1) + timedelta(hours=hour, seconds=rng.randrange(3600))
+
+        mode, statuses, status_cum, payments = mode_status[rng.choices(range(len(MODES)), cum_weights=mode_cum)[0]]
+        n_lines = rng.choices(line_counts, cum_weights=line_cum)[0]
+        picked = {m["id"]: m for m in rng.choices(menu, cum_weights=cum_weights, k=n_lines)}
+
+        subtotal = 0
+        for mi in picked.values():
+            qty = rng.choices((1, 2, 3), cum_weights=(75, 95, 100))[0]
+            line_total = mi["price_cents"] * qty
+            subtotal += line_total
+            items.append({
+                "order_id": order_id,
+                "menu_item_id": mi["id"],
+                "quantity": qty,
+                "unit_price_cents": mi["price_cents"],
+                "line_total_cents": line_total,
+                "item_name": mi["name"],
+                "item_category": mi["category"],
+            })
+
+        discount, coupon_code = 0, None
+        if subtotal >= min_cents and rng.random() < COUPON_RATE:
+            discount, coupon_code = min(subtotal * percent // 100, max_discount), code
+
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        orders.append({
+            "id": order_id,
+            "customer_name": f"{first} {last}",
+            "customer_phone": f"9{rng.randrange(10**9):09d}",
+            "customer_email": f"{first.lower()}.{last.lower()}{rng.randrange(1000)}@example.com"
+            if rng.random() < 0.5 else None,
+            "mode": mode,
+            "status": rng.choices(statuses, cum_weights=status_cum)[0],
+            "subtotal_cents": subtotal,
+            "discount_cents": discount,
+            "total_cents": subtotal - discount,
+            "coupon_code": coupon_code,
+            "payment_mode": rng.choice(payments),
+            "created_at": created_at,
+        })
+    return orders, items
+
+
+def _bulk_engine(url: str):
+    engine = create_engine(url)
+    if engine.dialect.name == "sqlite":
+        # Bulk load: skip fsyncs. journal_mode is left alone since it is
+        # persistent and the app database may rely on WAL.
+        install_sqlite_pragmas(engine, {"synchronous": "OFF", "busy_timeout": 30000})
+    return engine
+
+
+def _load_chunks(url: str, chunks: list[int], params: dict) -> int:
+    """Generate and insert ``chunks`` into ``url``; runs in a worker process."""
+    engine = _bulk_engine(url)
+    order_table, item_table = Order.__table__, OrderItem.__table__
+    written = 0
+    try:
+        for chunk in chunks:
+            orders, items = _generate_chunk(chunk, params)
+            with engine.begin() as conn:
+                conn.execute(insert(order_table), orders)
+                conn.execute(insert(item_table), items)
+            written += len(orders)
+    finally:
+        engine.dispose()
+    return written
+
+
+def _prepare_target(url: str, menu_items: int, seed: int) -> tuple[list[dict], int]:
+    """Create tables, top up the synthetic menu; return (menu, next order id offset)."""
+    engine = _bulk_engine(url)
+    try:
+        db.metadata.create_all(engine)
+        with engine.begin() as conn:
+            existing = conn.execute(select(func.count(MenuItem.id))).scalar()
+            if existing < menu_items:
+                start_id = (conn.execute(select(func.max(MenuItem.id))).scalar() or 0) + 1
+                rows = generate_menu(menu_items - existing, seed, start_id)
+                conn.execute(insert(MenuItem.__table__), rows)
+                conn.execute(insert(InventoryItem.__table__), [
+                    {"menu_item_id": r["id"], "name": r["name"], "stock": 100, "last_restock": None}
+                    for r in rows
+                ])
+            menu = [
+                dict(row._mapping)
+                for row in conn.execute(
+                    select(MenuItem.id, MenuItem.name, MenuItem.category, MenuItem.price_cents)
+                    .order_by(MenuItem.id)
+                )
+            ]
+            offset = conn.execute(select(func.max(Order.id))).scalar() or 0
+    finally:
+        engine.dispose()
+    return menu, offset
+
+
+def _fix_sequences(url: str) -> None:
+    """Explicit ids bypass Postgres sequences; move them past the new rows."""
+    engine = create_engine(url)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for table in ("order", "order_item", "menu_item", "inventory_item"):
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+                    f"COALESCE((SELECT MAX(id) FROM \"{table}\"), 1))"
+                ))
+    engine.dispose()
+
+
+def seed_synthetic(
+    menu_items: int = 500,
+    orders: int = 100_000,
+    days: int = 365,
+    end_date: datetime | None = None,
+    seed: int = 1,
+    batch_size: int = 10_000,
+    workers: int = 1,
+    shards: int = 0,
+    shard_dir: str = "synthetic_shards",
+) -> None:
+    if shards:
+        os.makedirs(shard_dir, exist_ok=True)
+        urls = [f"sqlite:///{os.path.abspath(os.path.join(shard_dir, f'shard-{i:03d}.db'))}" for i in range(shards)]
+    else:
+        urls = [db.engine.url.render_as_string(hide_password=False)]
+
+    prepared = [_prepare_target(url, menu_items, seed) for url in urls]
+    menu, _ = prepared[0]
+    if not menu:
+        raise ValueError("No menu items to order from; use --menu-items > 0.")
+
+    end = (end_date or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+    params = {
+        "seed": seed,
+        "menu": menu,
+        "cum_weights": _popularity_cum_weights(menu, seed),
+        "end": end,
+        "days": days,
+        "orders": orders,
+        "chunk_size": batch_size,
+        # Shared across shards so order ids stay globally unique.
+        "order_id_offset": max(offset for _, offset in prepared),
+    }
+    n_chunks = -(-orders // batch_size)
+
+    # One task per SQLite file (single writer); Postgres splits chunks across workers.
+    tasks = []
+    for i, url in enumerate(urls):
+        shard_chunks = list(range(i, n_chunks, len(urls)))
+        lanes = workers if url.startswith("postgresql") else 1
+        tasks += [(url, shard_chunks[lane::lanes]) for lane in range(lanes) if shard_chunks[lane::lanes]]
+
+    if workers <= 1 or len(tasks) == 1:
+        written = sum(_load_chunks(url, chunks, params) for url, chunks in tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_load_chunks, url, chunks, params) for url, chunks in tasks]
+            written = sum(f.result() for f in futures)
+
+    for url in urls:
+        _fix_sequences(url)
+
+    target = f"{shards} shards in {shard_dir}" if shards else "app database"
+    print(f"Synthetic seed complete: {len(menu)} menu items, {written} orders into {target}")
@@ -0,0 +1,87 @@
+"""Template compilation and rendered-fragment caches.
+
+Compiled templates are kept in a Jinja ``FileSystemBytecodeCache`` shared by
+all workers, and gunicorn's master compiles every template once after
+preloading (see gunicorn.conf.py), so workers never compile at boot.
+
+``cached_fragment`` stores rendered blocks of HTML keyed by the explicit
+inputs that determine them::
+
+    {% call cached_fragment("menu_category", items_version, mode, category) %}
+      ... only rendered on a miss ...
+    {% endcall %}
+
+Everything the block reads must be in the key; anything per-user (cart,
+session, flashes) belongs outside it. A version in the key must be the one
+the data came with (``get_menu_snapshot``), not re-read at render time.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from jinja2 import FileSystemBytecodeCache
+
+from metrics import CACHE_LOOKUPS
+
+
+class FragmentCache:
+    """Bounded LRU of rendered fragments, per worker."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = CACHE_LOOKUPS.labels("fragment", "hit")
+        self._misses = CACHE_LOOKUPS.labels("fragment", "miss")
+
+    def render(self, key: tuple, caller):
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+        if html is not None:
+            self._hits.inc()
+            return html
+
+        self._misses.inc()
+        html = caller()
+        with self._lock:
+            self._entries[key] = html
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def precompile_templates(app) -> int:
+    """Compile every template into the environment (and bytecode) cache."""
+    env = app.jinja_env
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+def init_template_cache(app) -> None:
+    cache_dir = app.config["JINJA_BYTECODE_CACHE_DIR"]
+    if cache_dir:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    # Without a directory Jinja uses a per-user one it creates 0700 and
+    # refuses if another user owns it; a shared predictable path is not safe.
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir or None)
+
+    enabled = app.config["FRAGMENT_CACHE_ENABLED"]
+    fragments = FragmentCache(app.config["FRAGMENT_CACHE_SIZE"])
+    app.extensions["fragment_cache"] = fragments
+
+    def cached_fragment(name, *key, caller):
+        # With auto-reload (debug) edited templates must show up immediately.
+        if not enabled or app.jinja_env.auto_reload:
+            return caller()
+        return fragments.render((name, *key), caller)
+
+    app.jinja_env.globals.update(cached_fragment=cached_fragment)
@@ -1,12 +1,19 @@
 import re
+import os
 import json
+import queue
+import atexit
+import random
 import logging
+import threading
 from datetime import datetime
-from typing import Optional, Dict, Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Mapping, Optional
 from functools import wraps
 
 from flask import flash, redirect, request, session, url_for
-from app import db
+from extensions import db
+from metrics import LOG_RECORDS_DROPPED
 from models import User
 
 
@@ -28,14 +35,22 @@ def sanitize_string(value: str, max_length: Optional[int] = None) -> str:
     return sanitized
 
 
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+# Allow digits, spaces, hyphens, plus, and parentheses
+_PHONE_RE = re.compile(r'^[\d\s\-\+\(\)]+$')
+# Allow letters, spaces, hyphens, apostrophes, periods, but not digits
+_NAME_RE = re.compile(r'^[a-zA-Z\u00C0-\uFFFF\s\-\.\']+$')
+_PRICE_STRIP_RE = re.compile(r'[^\d.]')
+_ITEM_SPEC_PART_RE = re.compile(r'^\s*(\d+)\s*:\s*(-?\d+)\s*$')
+
+
 def validate_email(email: str) -> bool:
     """Validate email format."""
     if not email:
         return False
     
     email = email.strip().lower()
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 
 def validate_phone(phone: str) -> bool:
@@ -44,9 +59,7 @@ def validate_phone(phone: str) -> bool:
         return False
     
     phone = phone.strip()
-    # Allow digits, spaces, hyphens, plus, and parentheses
-    pattern = r'^[\d\s\-\+\(\)]+$'
-    return bool(re.match(pattern, phone)) and len(phone) >= 10
+    return bool(_PHONE_RE.match(phone)) and len(phone) >= 10
 
 
 def validate_name(name: str) -> bool:
@@ -55,9 +68,7 @@ def validate_name(name: str) -> bool:
         return False
     
     name = name.strip()
-    # Allow letters, spaces, hyphens, apostrophes, periods, but not digits
-    pattern = r'^[a-zA-Z\u00C0-\uFFFF\s\-\.\']+$'
-    return bool(re.match(pattern, name)) and len(name) >= 2
+    return bool(_NAME_RE.match(name)) and len(name) >= 2
 
 
 def validate_quantity(qty: str) -> Optional[int]:
@@ -80,7 +91,7 @@ def validate_price(price: str) -> Optional[int]:
             return None
             
         # Remove currency symbols and convert to float
-        price_clean = re.sub(r'[^\d.]', '', price)
+        price_clean = _PRICE_STRIP_RE.sub('', price)
         if not price_clean:  # Empty after cleaning
             return None
             
@@ -149,6 +160,138 @@ def sanitize_form_data(form_data: Dict[str, Any], rules: Dict[str, Dict[str, Any
     return sanitized
 
 
+_FALSE_STRINGS = frozenset({'', '0', 'false', 'no', 'off'})
+
+_TEXT_CHECKS = {
+    'email': (_EMAIL_RE.match, 0),
+    'phone': (_PHONE_RE.match, 10),
+    'name': (_NAME_RE.match, 2),
+}
+
+
+def _compile_field(field: str, rule: Dict[str, Any]) -> Callable[[Any], Any]:
+    kind = rule.get('type', 'string')
+    required = rule.get('required', False)
+    label = rule.get('label') or field.replace('_', ' ').capitalize()
+    missing_message = f"{label} is required."
+    invalid_message = f"Invalid {label[0].lower() + label[1:]}."
+
+    if kind in ('string', 'email', 'phone', 'name'):
+        max_length = rule.get('max_length')
+        lower = rule.get('lower', False)
+        default = rule.get('default', '')
+        check, min_length = _TEXT_CHECKS.get(kind, (None, 0))
+
+        def parse(raw):
+            value = raw.strip() if raw else ''
+            if max_length:
+                value = value[:max_length]
+            if not value:
+                if required:
+                    raise ValueError(missing_message)
+                return default
+            if lower:
+                value = value.lower()
+            if check is not None and (len(value) < min_length or not check(value)):
+                raise ValueError(invalid_message)
+            return value
+
+    elif kind == 'raw':
+        def parse(raw):
+            if not raw and required:
+                raise ValueError(missing_message)
+            return raw or ''
+
+    elif kind in ('integer', 'quantity'):
+        minimum = 1 if kind == 'quantity' else rule.get('min')
+        maximum = rule.get('max')
+        default = rule.get('default')
+        below_message = f"{label} must be at least {minimum}."
+        above_message = f"{label} must be at most {maximum}."
+
+        def parse(raw):
+            if raw is None or not raw.strip():
+                if required:
+                    raise ValueError(missing_message)
+                return default
+            try:
+                value = int(raw)
+            except ValueError:
+                raise ValueError(invalid_message) from None
+            if minimum is not None and value < minimum:
+                raise ValueError(below_message)
+            if maximum is not None and value > maximum:
+                raise ValueError(above_message)
+            return value
+
+    elif kind == 'price':
+        default = rule.get('default', 0)
+
+        def parse(raw):
+            if raw is None or not raw.strip():
+                if required:
+                    raise ValueError(missing_message)
+                return default
+            value = validate_price(raw)
+            if value is None:
+                raise ValueError(invalid_message)
+            return value
+
+    elif kind == 'choice':
+        choices = frozenset(rule['choices'])
+        default = rule.get('default')
+
+        def parse(raw):
+            if not raw:
+                if required:
+                    raise ValueError(missing_message)
+                return default
+            if raw not in choices:
+                raise ValueError(invalid_message)
+            return raw
+
+    elif kind == 'item_spec':
+        def parse(raw):
+            items = parse_items_spec(raw or '')
+            if not items and required:
+                raise ValueError(missing_message)
+            return items
+
+    elif kind == 'bool':
+        default = rule.get('default', False)
+
+        def parse(raw):
+            # Checkboxes send "on" or nothing; CSV/JSON imports spell it out.
+            if raw is None:
+                return default
+            return raw.strip().lower() not in _FALSE_STRINGS
+
+    else:
+        raise ValueError(f"Unknown field type {kind!r} for {field}")
+
+    return parse
+
+
+def compile_form_schema(rules: Dict[str, Dict[str, Any]]) -> Callable[[Mapping[str, Any]], Dict[str, Any]]:
+    """
+    Build a validator for ``rules`` once, typically at import time.
+
+    Rules use the ``sanitize_form_data`` format, plus types 'raw' (unstripped,
+    e.g. passwords), 'integer' (optional 'min' and 'max'), 'choice' ('choices'),
+    'item_spec' and 'bool', and the keys 'lower' and 'label' (used in error
+    messages). The returned function takes a form mapping and returns the
+    cleaned values, raising ValueError with a user-facing message on the
+    first invalid field. Blank optional fields get 'default'.
+    """
+    parsers = tuple((field, _compile_field(field, rule)) for field, rule in rules.items())
+
+    def validate(form: Mapping[str, Any]) -> Dict[str, Any]:
+        get = form.get
+        return {field: parse(get(field)) for field, parse in parsers}
+
+    return validate
+
+
 # ============================================================================
 # AUTHENTICATION UTILITIES
 # ============================================================================
@@ -213,20 +356,18 @@ def cart_count() -> int:
 
 
 def parse_items_spec(spec: str) -> list[tuple[int, int]]:
-    if not spec:
-        return []
-
-    parts = [p.strip() for p in spec.split(";") if p.strip()]
+    """Parse ``item_id:qty;item_id:qty`` into ``[(item_id, qty), ...]``."""
     items: list[tuple[int, int]] = []
-    for p in parts:
-        if ":" not in p:
+    for part in spec.split(";"):
+        if not part.strip():
+            continue
+        match = _ITEM_SPEC_PART_RE.match(part)
+        if match is None:
             raise ValueError("Invalid format. Use item_id:qty;item_id:qty")
-        item_id_s, qty_s = [x.strip() for x in p.split(":", 1)]
-        item_id = int(item_id_s)
-        qty = int(qty_s)
+        qty = int(match[2])
         if qty <= 0:
             raise ValueError("Quantity must be >= 1")
-        items.append((item_id, qty))
+        items.append((int(match[1]), qty))
     return items
 
 
@@ -234,20 +375,113 @@ def parse_items_spec(spec: str) -> list[tuple[int, int]]:
 # LOGGING UTILITIES
 # ============================================================================
 
+class _DroppingQueueHandler(QueueHandler):
+    """Hands records to the listener thread without ever blocking the caller.
+
+    ``prepare`` is a no-op so formatting and JSON encoding happen on the
+    listener thread; when the bounded queue is full the record is dropped
+    and counted instead of waiting for the writer to catch up.
+    """
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class _JSONFormatter(logging.Formatter):
+    def format(self, record):
+        if not isinstance(record.msg, dict):
+            return super().format(record)
+        log_data = {"timestamp": datetime.utcfromtimestamp(record.created).isoformat()}
+        log_data.update(record.msg)
+        return json.dumps(log_data, separators=(",", ":"), default=str)
+
+
 class StructuredLogger:
-    def __init__(self, name: str = "cafe_fusion"):
+    def __init__(self, name: str = "cafe_fusion", queue_size: int = 10000,
+                 sample_rates: Optional[Dict[str, float]] = None):
         self.logger = logging.getLogger(name)
+        self.sample_rates = dict(sample_rates or {})
+        self._queue_size = queue_size
+        self._queue_handler = None
+        self._output = None
+        self._listener = None
+        self._listener_pid = None
+        self._queue_pid = os.getpid()
+        self._lock = threading.Lock()
         if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(message)s')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+            self._output = logging.StreamHandler()
+            self._output.setFormatter(_JSONFormatter('%(message)s'))
+            self._queue_handler = _DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+            self.logger.addHandler(self._queue_handler)
             self.logger.setLevel(logging.INFO)
-    
+            # Root handlers (gunicorn's, basicConfig) would write every event
+            # a second time, synchronously, defeating the queue.
+            self.logger.propagate = False
+
+    def configure(self, queue_size: Optional[int] = None,
+                  sample_rates: Optional[Dict[str, float]] = None):
+        if sample_rates is not None:
+            self.sample_rates = dict(sample_rates)
+        if queue_size is not None and queue_size != self._queue_size:
+            self._queue_size = queue_size
+            # Rebuilt with the new size the next time the listener starts.
+            with self._lock:
+                self._stop_listener()
+                self._listener_pid = None
+                self._queue_pid = None
+
+    def _ensure_listener(self):
+        # Threads do not survive fork; each gunicorn worker starts its own
+        # listener on a fresh queue.
+        if self._queue_handler is None or self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            if self._queue_pid != os.getpid():
+                self._queue_handler.queue = queue.Queue(maxsize=self._queue_size)
+                self._queue_pid = os.getpid()
+            self._listener = QueueListener(self._queue_handler.queue, self._output)
+            self._listener.start()
+            self._listener_pid = os.getpid()
+
+    def _stop_listener(self):
+        if self._listener is not None and self._listener_pid == os.getpid():
+            try:
+                self._listener.stop()
+            except queue.Full:
+                pass
+        self._listener = None
+
+    def _sample(self, event_type: str, action: str) -> Optional[float]:
+        """Return the sample rate if this event should be logged, else None."""
+        rate = self.sample_rates.get(f"{event_type}.{action}", self.sample_rates.get(event_type, 1.0))
+        if rate >= 1.0:
+            return 1.0
+        if random.random() < rate:
+            return rate
+        return None
+
+    def _emit(self, level: int, log_data: Dict[str, Any], rate: float):
+        if rate < 1.0:
+            log_data["sample_rate"] = rate
+        self._ensure_listener()
+        self.logger.log(level, log_data)
+
     def log_order(self, order_id: int, action: str, user_id: Optional[int] = None, 
                   details: Optional[Dict[str, Any]] = None):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        rate = self._sample("order", action)
+        if rate is None:
+            return
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
             "type": "order",
             "order_id": order_id,
             "action": action,
@@ -256,11 +490,10 @@ class StructuredLogger:
         if details:
             log_data.update(details)
         
-        self.logger.info(json.dumps(log_data))
+        self._emit(logging.INFO, log_data, rate)
     
     def log_error(self, error: Exception, context: Optional[Dict[str, Any]] = None):
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
             "type": "error",
             "error_type": type(error).__name__,
             "error_message": str(error)
@@ -268,12 +501,16 @@ class StructuredLogger:
         if context:
             log_data.update(context)
         
-        self.logger.error(json.dumps(log_data))
+        self._emit(logging.ERROR, log_data, 1.0)
     
-    def log_auth(self, user_id: int, action: str, email: str, 
+    def log_auth(self, user_id: Optional[int], action: str, email: str, 
                  success: bool, details: Optional[Dict[str, Any]] = None):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        rate = self._sample("auth", action)
+        if rate is None:
+            return
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
             "type": "auth",
             "user_id": user_id,
             "action": action,
@@ -283,8 +520,33 @@ class StructuredLogger:
         if details:
             log_data.update(details)
         
-        self.logger.info(json.dumps(log_data))
+        self._emit(logging.INFO, log_data, rate)
+
+    def flush(self):
+        """Drain the queue (used at exit and by scripts that need the output)."""
+        with self._lock:
+            self._stop_listener()
+            self._listener_pid = None
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse ``"auth.login=0.1,order=1"`` into ``{"auth.login": 0.1, "order": 1.0}``."""
+    rates = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        key, value = part.split("=", 1)
+        rates[key.strip()] = min(1.0, max(0.0, float(value)))
+    return rates
 
 
 # Global logger instance
 logger = StructuredLogger()
+atexit.register(logger.flush)
+
+
+def init_structured_logging(app) -> None:
+    logger.configure(
+        queue_size=app.config["LOG_QUEUE_SIZE"],
+        sample_rates=parse_sample_rates(app.config["LOG_SAMPLE_RATES"]),
+    )